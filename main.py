@@ -1,10 +1,25 @@
 import asyncio
+import ctypes
+import ctypes.util
+import functools
+import hashlib
+import io
 import json
+import mmap
 import os
+import posixpath
 import shlex
 import shutil
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import signal
+import struct
+import tarfile
+import tempfile
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 import vdf
 
 # The decky plugin module is located at decky-loader/plugin
@@ -20,8 +35,62 @@ DATA_DIR = os.path.join(USER_HOME, ".local", "share", PLUGIN_ID)
 SETTINGS_PATH = os.path.join(DATA_DIR, "settings.json")
 CACHE_GAMES_PATH = os.path.join(DATA_DIR, "games.json")
 SAVES_DIR = os.path.join(DATA_DIR, "saves")
+JOURNAL_PATH = os.path.join(DATA_DIR, "journal.json")
+MIRROR_HEALTH_PATH = os.path.join(DATA_DIR, "mirrors.json")
+DISK_USAGE_PATH = os.path.join(DATA_DIR, "disk-usage.json")
+PREFETCH_DIR = os.path.join(DATA_DIR, "prefetch")
+SHADER_CACHE_DIR = os.path.join(DATA_DIR, "shadercache")
+PREFETCH_MARKER = ".deckyfin-prefetch.json"
 PROTONTRICKS_CMD = "flatpak run com.github.Matoking.protontricks"
 PROTONTRICKS_FLAGS = "--force --unattended"
+SAVE_MODES = ("loose", "packed")
+PACKED_SAVE_ARCHIVE = "saves.tar.gz"
+PACKED_SAVE_INDEX = "saves-index.json"
+JOB_RECOVERY_MODES = ("resume", "rollback")
+MANIFEST_NAME = "deckyfin-manifest.json"
+# Folder inside each prefix that DXVK and VKD3D-Proton are pointed at
+PREFIX_SHADER_CACHE = "shadercache"
+DXVK_CACHE_SUFFIX = ".dxvk-cache"
+# Magic, cache version and (for fixed-size legacy caches) entry size
+DXVK_HEADER = struct.Struct("<4sII")
+DXVK_LEGACY_VERSION = 7
+DXVK_HASH_SIZE = 20
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+# rsync exit codes caused by the connection rather than the transfer itself
+RSYNC_NETWORK_ERRORS = {5, 10, 12, 30, 35, 255}
+# Resumes of one host after its connection dropped during a game pause
+RSYNC_PAUSE_RETRIES = 3
+SSH_PROBE_OPTIONS = ["-o", "BatchMode=yes", "-o", "ConnectTimeout=5"]
+PROBE_PAYLOAD_BYTES = 4 * 1024 * 1024
+MIRROR_FAILURE_LIMIT = 3
+BATCH_STAGING_NAME = ".deckyfin-batch"
+DISK_RESCAN_SECONDS = 3600
+IONICE_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+GAMING_POLL_SECONDS = 5
+THROTTLE_PERIOD_SECONDS = 2.0
+PREFETCH_CHECK_SECONDS = 600
+STEAM_ROOT = os.path.join(USER_HOME, ".local", "share", "Steam")
+# userdata folders are named after the account id, the SteamID64 minus this
+STEAM_ID64_BASE = 76561197960265728
+OUTPUT_TAIL_BYTES = 64 * 1024
+PEER_DISCOVERY_MESSAGE = b"DECKYFIN-DISCOVER"
+PEER_DISCOVERY_SECONDS = 1.5
+PEER_TIMEOUT_SECONDS = 15
+PEER_DOWNLOADS = 4
+PEER_CHUNK_SIZE = 1024 * 1024
+# What a missing, slow, truncated or malformed peer answer can raise
+PEER_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    EOFError,
+    KeyError,
+    TypeError,
+    RuntimeError,
+    ValueError,
+)
+PIPE_READ_SIZE = 64 * 1024
+JOURNAL_HISTORY = 20
 
 
 def _now_iso() -> str:
@@ -35,15 +104,181 @@ def _slugify(value: str) -> str:
     return safe.strip("-").lower() or "game"
 
 
+# proton_sync_paths placeholders and where they point inside drive_c
+SYNC_PATH_TOKENS: Dict[str, Tuple[str, ...]] = {
+    "%USERPROFILE%": ("users", "steamuser"),
+    "%APPDATA%": ("users", "steamuser", "AppData", "Roaming"),
+    "%LOCALAPPDATA%": ("users", "steamuser", "AppData", "Local"),
+    "%DOCUMENTS%": ("users", "steamuser", "Documents"),
+    "%DRIVE_C%": (),
+}
+CATALOG_TEXT_FIELDS = (
+    "path",
+    "proton_version",
+    "executable",
+    "launch_options",
+    "shader_cache_path",
+)
+CATALOG_LIST_FIELDS = ("proton_dependencies", "proton_sync_paths", "categories")
+
+# Compiled catalogs keyed by path, reused while the file content is unchanged
+_compiled_catalogs: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_sync_path(value: str) -> Tuple[bool, str]:
+    """Pre-resolve a ``proton_sync_paths`` template.
+
+    Returns ``(True, path)`` with ``path`` relative to the prefix's drive_c
+    for placeholder paths, or ``(False, path)`` for absolute Linux paths.
+    Raises ``ValueError`` for anything else.
+    """
+    if os.path.isabs(value):
+        return False, os.path.normpath(os.path.expanduser(value))
+    token, _, rest = value.replace("\\", "/").partition("/")
+    if token not in SYNC_PATH_TOKENS:
+        raise ValueError(
+            f"{value!r} must be absolute or start with one of "
+            f"{', '.join(SYNC_PATH_TOKENS)}"
+        )
+    parts = [part for part in rest.split("/") if part not in ("", ".")]
+    # "%APPDATA%/../LocalLow/..." is fine as long as it stays below drive_c
+    path = posixpath.normpath("/".join([*SYNC_PATH_TOKENS[token], *parts]) or ".")
+    if path == ".." or path.startswith("../"):
+        raise ValueError(f"{value!r} must stay inside the prefix")
+    return True, "" if path == "." else path
+
+
+def compile_catalog(
+    games: List[Any],
+) -> Tuple[List[Dict[str, Any]], List[str], List[Dict[str, Any]]]:
+    """Validate and normalize every catalog entry in one pass.
+
+    Returns the usable entries, with types normalized and ``slug`` filled
+    in, every problem found, and the ``slug``/``steam_appid`` that could be
+    read from each rejected entry. Entries with errors are left out so
+    nothing is downloaded for them, but their local data is still theirs.
+    """
+    compiled: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    rejected: List[Dict[str, Any]] = []
+    seen_names: Set[str] = set()
+    seen_slugs: Set[str] = set()
+    seen_appids: Set[int] = set()
+    for index, raw in enumerate(games):
+        if not isinstance(raw, dict):
+            errors.append(f"games[{index}]: must be an object")
+            continue
+        label = f"games[{index}]"
+        problems: List[str] = []
+        entry = dict(raw)
+
+        name = entry.get("name")
+        if not isinstance(name, str) or not name.strip():
+            problems.append("'name' must be a non-empty string")
+        else:
+            entry["name"] = name = name.strip()
+            label = f"{label} ({name})"
+            entry["slug"] = _slugify(name)
+            if name in seen_names:
+                problems.append("'name' is used by another game")
+            elif entry["slug"] in seen_slugs:
+                problems.append(
+                    f"folder name '{entry['slug']}' clashes with another game"
+                )
+
+        appid = entry.get("steam_appid")
+        if isinstance(appid, str) and appid.strip().isdigit():
+            appid = int(appid)
+        if isinstance(appid, bool) or not isinstance(appid, int) or appid <= 0:
+            problems.append("'steam_appid' must be a positive integer")
+        elif appid in seen_appids:
+            problems.append(f"'steam_appid' {appid} is used by another game")
+        else:
+            entry["steam_appid"] = appid
+
+        for field in CATALOG_TEXT_FIELDS:
+            value = entry.get(field, "")
+            if value is None:
+                value = ""
+            if not isinstance(value, str):
+                problems.append(f"'{field}' must be a string")
+            else:
+                entry[field] = value.strip()
+
+        for field in CATALOG_LIST_FIELDS:
+            value = entry.get(field) or []
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(
+                isinstance(item, str) for item in value
+            ):
+                problems.append(f"'{field}' must be a list of strings")
+            else:
+                entry[field] = value
+
+        for sync_path in entry.get("proton_sync_paths") or []:
+            if isinstance(sync_path, str):
+                try:
+                    compile_sync_path(sync_path)
+                except ValueError as err:
+                    problems.append(f"'proton_sync_paths': {err}")
+
+        version = entry.get("version", "")
+        if isinstance(version, (int, float)) and not isinstance(version, bool):
+            version = str(version)
+        if not isinstance(version, str):
+            problems.append("'version' must be a string")
+        else:
+            entry["version"] = version
+
+        save_mode = entry.get("save_mode") or "loose"
+        if save_mode not in SAVE_MODES:
+            problems.append(f"'save_mode' must be one of {', '.join(SAVE_MODES)}")
+        entry["save_mode"] = save_mode
+
+        if not isinstance(entry.get("prefetch", False), bool):
+            problems.append("'prefetch' must be true or false")
+
+        if problems:
+            errors.extend(f"{label}: {problem}" for problem in problems)
+            rejected.append(
+                {
+                    "slug": entry.get("slug"),
+                    "steam_appid": (
+                        appid
+                        if isinstance(appid, int) and not isinstance(appid, bool)
+                        else None
+                    ),
+                }
+            )
+            continue
+        seen_names.add(name)
+        seen_slugs.add(entry["slug"])
+        seen_appids.add(appid)
+        compiled.append(entry)
+    return compiled, errors, rejected
+
+
 def load_games_json(path: str) -> Dict[str, Any]:
-    """Load games config from a JSON file. Returns dict with 'games' and 'savesPath'."""
+    """Load and compile a games config file.
+
+    Returns a dict with 'games' (the valid, normalized entries), 'savesPath',
+    'errors' and 'rejected' (see :func:`compile_catalog`). The compiled result is reused until the file changes.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"Games file not found at {path}")
 
+    with open(path, "rb") as handle:
+        content = handle.read()
+    revision = hashlib.sha256(content).hexdigest()
+    cached = _compiled_catalogs.get(path)
+    if cached and cached[0] == revision:
+        return cached[1]
+
     try:
-        with open(path, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
-    except json.JSONDecodeError as e:
+        data = json.loads(content)
+    except ValueError as e:
         raise ValueError(f"Invalid JSON in games file: {e}") from e
 
     if not isinstance(data, dict):
@@ -53,10 +288,17 @@ def load_games_json(path: str) -> Dict[str, Any]:
     if not isinstance(games, list):
         raise ValueError("Games file must have a 'games' key containing a list")
 
-    return {
-        "games": games,
+    compiled, errors, rejected = compile_catalog(games)
+    for error in errors:
+        decky.logger.warning(f"[Deckyfin] Skipping catalog entry {error}")
+    result = {
+        "games": compiled,
         "savesPath": data.get("savesPath", ""),
+        "errors": errors,
+        "rejected": rejected,
     }
+    _compiled_catalogs[path] = (revision, result)
+    return result
 
 
 DEFAULT_SETTINGS: Dict[str, Any] = {
@@ -69,24 +311,1671 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     },
     "saveBackupPath": os.path.join(SAVES_DIR),
     "rsyncFlags": "-avz",
+    "jobRecovery": "resume",
+    "mirrorHosts": [],
+    "mirrorProbeInterval": 300,
+    "governor": {
+        "enabled": True,
+        "nice": 10,
+        "ioClass": "idle",
+        "whileGaming": "pause",
+        "bwlimitKbps": 2000,
+        "throttleDuty": 0.25,
+    },
+    "prefetch": {
+        "enabled": False,
+        "budgetGB": 20,
+        "windowStart": "01:00",
+        "windowEnd": "07:00",
+        "predictedGames": 2,
+    },
+    "peers": {
+        "serve": False,
+        "port": 8730,
+        "discover": True,
+        "discoveryPort": 8731,
+        "hosts": [],
+    },
+    # Seconds per subprocess before its process group is killed, 0 for none
+    "timeouts": {
+        "ssh": 120,
+        # Hashing a whole game on the host takes as long as reading it
+        "remoteHash": 0,
+        "rsync": 0,
+        "wineboot": 300,
+        "protontricks": 1800,
+    },
+    "storage": {
+        "indexInterval": 1800,
+        "prefixRetentionDays": 30,
+        "backupRetentionDays": 30,
+        "shortcutBackupsToKeep": 1,
+        "collectLocalOnlyBackups": False,
+    },
+    "saveWatcher": {
+        "enabled": False,
+        "quietPeriod": 30,
+        "pollInterval": 60,
+    },
 }
 
 
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+SAVE_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class SaveWatcher:
+    """Watch resolved save paths and report changed files after a quiet period.
+
+    Uses inotify when libc exposes it, so the watcher sleeps on a file
+    descriptor registered with the event loop and costs nothing while idle.
+    Otherwise it falls back to polling (mtime, size) snapshots at a low rate.
+    """
+
+    def __init__(
+        self,
+        on_flush: Callable[[str, Set[str]], Awaitable[None]],
+        quiet_period: float = 30,
+        poll_interval: float = 60,
+    ) -> None:
+        self._on_flush = on_flush
+        self._quiet_period = max(float(quiet_period), 1.0)
+        self._poll_interval = max(float(poll_interval), 5.0)
+        self._loop = asyncio.get_event_loop()
+        self._targets: Dict[str, List[str]] = {}
+        self._pending: Dict[str, Set[str]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._flushing: Set[asyncio.Task] = set()
+        self._libc = None
+        self._fd = -1
+        self._watches: Dict[int, Tuple[str, str, Optional[str]]] = {}
+        # Ancestors of roots that do not exist yet: wd -> {(game, child name)}
+        self._waiting: Dict[int, Set[Tuple[str, str]]] = {}
+        self._snapshots: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._poll_task: Optional[asyncio.Task] = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd >= 0 else "polling"
+
+    def start(self) -> None:
+        libc_name = ctypes.util.find_library("c")
+        try:
+            libc = ctypes.CDLL(libc_name or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            fd = -1
+        if fd >= 0:
+            self._libc = libc
+            self._fd = fd
+            self._loop.add_reader(fd, self._read_events)
+        else:
+            decky.logger.info("[Deckyfin] inotify unavailable, polling save paths")
+            self._poll_task = self._loop.create_task(self._poll_loop())
+        self._rewatch()
+
+    async def stop(self) -> None:
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
+        if self._fd >= 0:
+            self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = -1
+            self._watches.clear()
+            self._waiting.clear()
+        # Flush whatever was still waiting so no change is lost on unload
+        pending, self._pending = self._pending, {}
+        for game_name, paths in pending.items():
+            await self._run_flush(game_name, paths)
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def update_targets(self, targets: Dict[str, List[str]]) -> None:
+        """Replace the watched set with ``{game name: [resolved sync paths]}``."""
+        if targets == self._targets:
+            return
+        self._targets = {name: list(paths) for name, paths in targets.items()}
+        self._rewatch()
+
+    # inotify backend -----------------------------------------------------
+    def _rewatch(self) -> None:
+        if self._fd >= 0:
+            for wd in set(self._watches) | set(self._waiting):
+                self._libc.inotify_rm_watch(self._fd, wd)
+            self._watches.clear()
+            self._waiting.clear()
+            for game_name, roots in self._targets.items():
+                for root in roots:
+                    if os.path.isdir(root):
+                        self._watch_tree(game_name, root)
+                    elif os.path.isfile(root):
+                        self._add_watch(
+                            game_name, os.path.dirname(root), os.path.basename(root)
+                        )
+                    else:
+                        self._wait_for(game_name, root)
+        else:
+            self._snapshots = {
+                game_name: self._snapshot(roots)
+                for game_name, roots in self._targets.items()
+            }
+
+    def _add_watch(self, game_name: str, directory: str, only: Optional[str]) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), SAVE_WATCH_MASK
+        )
+        if wd < 0:
+            decky.logger.warning(
+                "[Deckyfin] Cannot watch %s: %s",
+                directory,
+                os.strerror(ctypes.get_errno()),
+            )
+            return
+        self._watches[wd] = (game_name, directory, only)
+
+    def _wait_for(self, game_name: str, root: str) -> None:
+        """Watch the nearest existing ancestor of a root that is not there yet.
+
+        Save folders are usually created on the game's first launch.
+        """
+        child = os.path.normpath(root)
+        parent = os.path.dirname(child)
+        while parent != child and not os.path.isdir(parent):
+            child, parent = parent, os.path.dirname(parent)
+        if parent == child:
+            return
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(parent), SAVE_WATCH_MASK
+        )
+        if wd >= 0:
+            self._waiting.setdefault(wd, set()).add(
+                (game_name, os.path.basename(child))
+            )
+
+    def _root_appeared(self, wd: int, game_name: str, child: str) -> None:
+        self._waiting.get(wd, set()).discard((game_name, child))
+        for root in self._targets.get(game_name, []):
+            if os.path.isdir(root):
+                self._watch_tree(game_name, root)
+            elif os.path.isfile(root):
+                self._add_watch(
+                    game_name, os.path.dirname(root), os.path.basename(root)
+                )
+                self._mark(game_name, root)
+            else:
+                # Only part of the path exists so far
+                self._wait_for(game_name, root)
+                continue
+            # Files may already be inside the new folder before the watch existed
+            for dirpath, _dirnames, filenames in os.walk(root):
+                for filename in filenames:
+                    self._mark(game_name, os.path.join(dirpath, filename))
+
+    def _watch_tree(self, game_name: str, root: str) -> None:
+        for dirpath, _dirnames, _filenames in os.walk(root):
+            self._add_watch(game_name, dirpath, None)
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = (
+                data[offset : offset + length]
+                .rstrip(b"\0")
+                .decode(errors="surrogateescape")
+            )
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; mark every watched root as changed
+                decky.logger.warning(
+                    "[Deckyfin] Save watcher missed events, backing up all saves"
+                )
+                for game_name, roots in self._targets.items():
+                    for root in roots:
+                        self._mark(game_name, root)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                self._waiting.pop(wd, None)
+                continue
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                for game_name, child in list(self._waiting.get(wd, ())):
+                    if child == name:
+                        self._root_appeared(wd, game_name, child)
+            watch = self._watches.get(wd)
+            if watch is None or not name:
+                continue
+            game_name, directory, only = watch
+            if only is not None and name != only:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land before the new watch exists, pick them up now
+                    self._watch_tree(game_name, path)
+                    for dirpath, _dirnames, filenames in os.walk(path):
+                        for filename in filenames:
+                            self._mark(game_name, os.path.join(dirpath, filename))
+                continue
+            self._mark(game_name, path)
+
+    # polling backend -----------------------------------------------------
+    @staticmethod
+    def _snapshot(roots: List[str]) -> Dict[str, Tuple[int, int]]:
+        state: Dict[str, Tuple[int, int]] = {}
+        stack = []
+        for root in roots:
+            if os.path.isfile(root):
+                stat = os.stat(root)
+                state[root] = (stat.st_mtime_ns, stat.st_size)
+            elif os.path.isdir(root):
+                stack.append(root)
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return state
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            for game_name, roots in list(self._targets.items()):
+                current = await asyncio.to_thread(self._snapshot, roots)
+                previous = self._snapshots.get(game_name, {})
+                self._snapshots[game_name] = current
+                for path in current.keys() | previous.keys():
+                    if current.get(path) != previous.get(path):
+                        self._mark(game_name, path)
+
+    # debounce ------------------------------------------------------------
+    def _mark(self, game_name: str, path: str) -> None:
+        self._pending.setdefault(game_name, set()).add(path)
+        handle = self._timers.pop(game_name, None)
+        if handle:
+            handle.cancel()
+        self._timers[game_name] = self._loop.call_later(
+            self._quiet_period, self._flush, game_name
+        )
+
+    def _flush(self, game_name: str) -> None:
+        self._timers.pop(game_name, None)
+        paths = self._pending.pop(game_name, set())
+        if not paths:
+            return
+        task = self._loop.create_task(self._run_flush(game_name, paths))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _run_flush(self, game_name: str, paths: Set[str]) -> None:
+        try:
+            await self._on_flush(game_name, paths)
+        except Exception as err:  # pylint: disable=broad-except
+            decky.logger.warning(
+                "[Deckyfin] Background save backup failed for %s: %s", game_name, err
+            )
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file using a memory-mapped, chunked read."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size:
+            with mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped, memoryview(mapped) as view:
+                for offset in range(0, size, HASH_CHUNK_SIZE):
+                    digest.update(view[offset : offset + HASH_CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+def hash_tree(
+    root: str, relatives: Optional[List[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Hash files below ``root`` in a thread pool.
+
+    Returns ``{relative path: {"size", "sha256"}}`` for every file (or only
+    ``relatives``), skipping the manifest itself. hashlib releases the GIL
+    while digesting, so the workers overlap I/O and hashing.
+    """
+    if relatives is None:
+        relatives = []
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                relative = os.path.relpath(os.path.join(dirpath, filename), root)
+                if relative != MANIFEST_NAME:
+                    relatives.append(relative.replace(os.sep, "/"))
+
+    def entry(relative: str) -> Tuple[str, Dict[str, Any]]:
+        path = os.path.join(root, *relative.split("/"))
+        return relative, {"size": os.path.getsize(path), "sha256": hash_file(path)}
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        return dict(pool.map(entry, sorted(relatives)))
+
+
+class _HashingReader:
+    """File wrapper that hashes everything tarfile reads through it."""
+
+    def __init__(self, handle) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._handle.read(size)
+        self.digest.update(chunk)
+        return chunk
+
+
+def pack_save_archive(
+    sources: List[Tuple[str, str]], archive_path: str
+) -> Dict[str, Any]:
+    """Write ``(path, arcname)`` sources into a gzip tar stream with a hash index.
+
+    Each file is read once: the tar writer pulls it through a hashing reader,
+    and the resulting index is appended as the last archive member and also
+    returned so it can be stored next to the archive.
+    """
+    index: Dict[str, Any] = {"created": _now_iso(), "files": {}}
+    tmp_path = f"{archive_path}.tmp"
+    os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+    with tarfile.open(tmp_path, "w:gz", compresslevel=6) as archive:
+        for source, arc_root in sources:
+            if os.path.isfile(source):
+                files = [(source, arc_root)]
+            else:
+                files = []
+                for dirpath, _dirnames, filenames in os.walk(source):
+                    relative_dir = os.path.relpath(dirpath, source)
+                    for filename in sorted(filenames):
+                        relative = os.path.normpath(
+                            os.path.join(relative_dir, filename)
+                        )
+                        files.append(
+                            (
+                                os.path.join(dirpath, filename),
+                                f"{arc_root}/{relative.replace(os.sep, '/')}",
+                            )
+                        )
+            for path, arcname in files:
+                if not os.path.isfile(path) or os.path.islink(path):
+                    continue
+                info = archive.gettarinfo(path, arcname)
+                with open(path, "rb") as handle:
+                    reader = _HashingReader(handle)
+                    archive.addfile(info, reader)
+                index["files"][arcname] = {
+                    "size": info.size,
+                    "sha256": reader.digest.hexdigest(),
+                }
+        payload = json.dumps(index, indent=2).encode("utf-8")
+        info = tarfile.TarInfo(PACKED_SAVE_INDEX)
+        info.size = len(payload)
+        info.mtime = int(datetime.utcnow().timestamp())
+        archive.addfile(info, io.BytesIO(payload))
+    os.replace(tmp_path, archive_path)
+    return index
+
+
+def unpack_save_archive(
+    archive_path: str,
+    targets: List[Tuple[str, str]],
+    index_path: Optional[str] = None,
+) -> List[str]:
+    """Stream members of a packed save archive to their targets.
+
+    ``targets`` maps archive roots to destination paths. Members outside the
+    known roots or with unsafe names are skipped. Every member is written to
+    a temporary file next to its target and checked against the archive
+    index (or the ``index_path`` sidecar when the archive has none). Live
+    saves are only replaced once the whole archive verified; otherwise
+    nothing is touched and the arcnames that did not match are returned.
+    """
+    mismatched: List[str] = []
+    index: Dict[str, Any] = {}
+    # arcname -> (temporary path, final path, sha256)
+    written: Dict[str, Tuple[str, str, str]] = {}
+    try:
+        with tarfile.open(archive_path, "r:gz") as archive:
+            for member in archive:
+                if member.name == PACKED_SAVE_INDEX:
+                    index = json.load(archive.extractfile(member))
+                    continue
+                if not member.isfile():
+                    continue
+                parts = member.name.split("/")
+                if member.name.startswith("/") or ".." in parts:
+                    decky.logger.warning(f"Skipping unsafe save member {member.name}")
+                    continue
+                for arc_root, destination in targets:
+                    if member.name == arc_root:
+                        target = destination
+                    elif member.name.startswith(f"{arc_root}/"):
+                        target = os.path.join(
+                            destination, *member.name[len(arc_root) + 1 :].split("/")
+                        )
+                    else:
+                        continue
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    tmp_path = f"{target}.tmp"
+                    digest = hashlib.sha256()
+                    source = archive.extractfile(member)
+                    written[member.name] = (tmp_path, target, "")
+                    with open(tmp_path, "wb") as handle:
+                        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                            digest.update(chunk)
+                            handle.write(chunk)
+                    os.utime(tmp_path, (member.mtime, member.mtime))
+                    written[member.name] = (tmp_path, target, digest.hexdigest())
+                    break
+        if not index and index_path and os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as handle:
+                index = json.load(handle)
+        for arcname, (_tmp_path, _target, digest) in written.items():
+            expected = index.get("files", {}).get(arcname, {}).get("sha256")
+            if expected and expected != digest:
+                mismatched.append(arcname)
+    except BaseException:
+        # A truncated or corrupt archive must not leave half the saves replaced
+        for tmp_path, _target, _digest in written.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+    for tmp_path, target, _digest in written.values():
+        if mismatched:
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, target)
+    return mismatched
+
+
+def _read_dxvk_cache(path: str) -> Optional[Tuple[bytes, List[Tuple[bytes, bytes]]]]:
+    """Split a DXVK state cache into its header and ``(hash, entry)`` pairs.
+
+    Returns ``None`` for anything that is not a readable ``.dxvk-cache``. A
+    trailing entry cut short (DXVK appends while the game runs) is dropped.
+    """
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except OSError:
+        return None
+    if len(data) < DXVK_HEADER.size:
+        return None
+    magic, version, entry_size = DXVK_HEADER.unpack_from(data)
+    if magic != b"DXVK":
+        return None
+    header = data[: DXVK_HEADER.size]
+    entries: List[Tuple[bytes, bytes]] = []
+    offset = DXVK_HEADER.size
+    if version <= DXVK_LEGACY_VERSION:
+        # Fixed-size entries that end with the SHA-1 of what precedes it
+        if entry_size <= DXVK_HASH_SIZE:
+            return None
+        while offset + entry_size <= len(data):
+            entry = data[offset : offset + entry_size]
+            entries.append((entry[-DXVK_HASH_SIZE:], entry))
+            offset += entry_size
+        return header, entries
+    # A 4-byte stage mask/size word, the SHA-1 of the data, then the data
+    while offset + 4 + DXVK_HASH_SIZE <= len(data):
+        (word,) = struct.unpack_from("<I", data, offset)
+        end = offset + 4 + DXVK_HASH_SIZE + (word >> 8)
+        if end > len(data):
+            break
+        entries.append(
+            (data[offset + 4 : offset + 4 + DXVK_HASH_SIZE], data[offset:end])
+        )
+        offset = end
+    return header, entries
+
+
+def merge_dxvk_cache(source: str, target: str) -> bool:
+    """Append the entries of one DXVK state cache missing from another.
+
+    Both files must share a header (cache version and entry layout);
+    otherwise ``target`` is left alone. Returns whether ``target`` grew.
+    """
+    incoming = _read_dxvk_cache(source)
+    current = _read_dxvk_cache(target)
+    if incoming is None or current is None or incoming[0] != current[0]:
+        return False
+    known = {digest for digest, _entry in current[1]}
+    added: List[bytes] = []
+    for digest, entry in incoming[1]:
+        if digest not in known:
+            known.add(digest)
+            added.append(entry)
+    if not added:
+        return False
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(current[0])
+        for _digest, entry in current[1]:
+            handle.write(entry)
+        for entry in added:
+            handle.write(entry)
+    os.replace(tmp_path, target)
+    return True
+
+
+def merge_cache_tree(source: str, target: str) -> List[str]:
+    """Merge the shader cache files under ``source`` into ``target``.
+
+    Files only on one side are copied over. DXVK state caches present on
+    both sides are merged entry by entry, so pipelines warmed on either
+    device survive. Other caches (VKD3D-Proton) cannot be merged yet and a
+    copy already in ``target`` is never replaced. Returns the relative paths
+    that were written.
+    """
+    merged: List[str] = []
+    for dirpath, _dirnames, filenames in os.walk(source):
+        for filename in filenames:
+            source_path = os.path.join(dirpath, filename)
+            relative = os.path.relpath(source_path, source)
+            target_path = os.path.join(target, relative)
+            if filename.endswith(".tmp"):
+                continue
+            if os.path.exists(target_path):
+                if filename.endswith(DXVK_CACHE_SUFFIX) and merge_dxvk_cache(
+                    source_path, target_path
+                ):
+                    merged.append(relative)
+                continue
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            # Never leave a half-copied cache where the game can read it
+            tmp_path = f"{target_path}.tmp"
+            try:
+                shutil.copy2(source_path, tmp_path)
+            except OSError:
+                continue
+            os.replace(tmp_path, target_path)
+            merged.append(relative)
+    return merged
+
+
+class OperationJournal:
+    """Crash-safe record of install/remove jobs kept in ``DATA_DIR``.
+
+    Every job lists its steps with the inputs needed to replay them. The file
+    is rewritten atomically after each state change, so after a restart any
+    job still marked ``running`` shows exactly which steps finished.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._jobs: List[Dict[str, Any]] = []
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    self._jobs = json.load(handle).get("jobs", [])
+            except (OSError, ValueError) as err:
+                decky.logger.error(f"[Deckyfin] Ignoring unreadable journal: {err}")
+
+    def begin(
+        self, kind: str, game_name: str, steps: List[Tuple[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        now = _now_iso()
+        job = {
+            "id": f"{kind}-{_slugify(game_name)}-{datetime.utcnow():%Y%m%d%H%M%S%f}",
+            "kind": kind,
+            "game": game_name,
+            "status": "running",
+            "created": now,
+            "updated": now,
+            "steps": [
+                {"name": name, "status": "pending", "inputs": inputs}
+                for name, inputs in steps
+            ],
+        }
+        self._jobs.append(job)
+        self._save()
+        return job
+
+    def start_step(self, job: Dict[str, Any], name: str) -> None:
+        self._update_step(job, name, status="running", started=_now_iso())
+
+    def finish_step(
+        self, job: Dict[str, Any], name: str, note: Optional[str] = None
+    ) -> None:
+        self._update_step(job, name, status="done", finished=_now_iso(), note=note)
+
+    def fail_step(self, job: Dict[str, Any], name: str, error: str) -> None:
+        self._update_step(job, name, status="failed", finished=_now_iso(), error=error)
+
+    def finish(self, job: Dict[str, Any], status: str) -> None:
+        job["status"] = status
+        job["updated"] = _now_iso()
+        self._save()
+
+    @staticmethod
+    def step(job: Dict[str, Any], name: str) -> Dict[str, Any]:
+        return next(step for step in job["steps"] if step["name"] == name)
+
+    def history(self, kind: str) -> List[Dict[str, Any]]:
+        """Completed jobs of ``kind``, newest first."""
+        return [
+            job
+            for job in reversed(self._jobs)
+            if job["kind"] == kind and job["status"] == "done"
+        ]
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        return [job for job in self._jobs if job["status"] == "running"]
+
+    def _update_step(self, job: Dict[str, Any], name: str, **fields: Any) -> None:
+        self.step(job, name).update(fields)
+        job["updated"] = _now_iso()
+        self._save()
+
+    def _save(self) -> None:
+        running = [job for job in self._jobs if job["status"] == "running"]
+        settled = [job for job in self._jobs if job["status"] != "running"]
+        self._jobs = settled[-JOURNAL_HISTORY:] + running
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"jobs": self._jobs}, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self._path)
+
+
+class ProcessResult:
+    """Outcome of :func:`run_process`.
+
+    Only the last ``OUTPUT_TAIL_BYTES`` of each stream are kept; callers that
+    need the whole output pass a sink to ``run_process`` instead.
+    """
+
+    def __init__(
+        self,
+        args: List[str],
+        returncode: int,
+        duration: float,
+        stdout: bytes,
+        stderr: bytes,
+        timed_out: bool = False,
+    ) -> None:
+        self.args = args
+        self.returncode = returncode
+        self.duration = duration
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    def output_tail(self) -> str:
+        """stderr tail, or the stdout tail when stderr is empty."""
+        text = self.stderr.decode(errors="replace").strip()
+        return text or self.stdout.decode(errors="replace").strip()
+
+    def describe(self) -> str:
+        name = os.path.basename(self.args[0]) if self.args else "process"
+        if self.timed_out:
+            return f"{name} timed out after {self.duration:.0f}s: {self.output_tail()}"
+        return f"{name} failed ({self.returncode}): {self.output_tail()}"
+
+
+class _TailBuffer:
+    """Fixed-size buffer keeping the last ``limit`` bytes written to it."""
+
+    def __init__(self, limit: int = OUTPUT_TAIL_BYTES) -> None:
+        self._limit = limit
+        self._data = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self._data += chunk[-self._limit :]
+        excess = len(self._data) - self._limit
+        if excess > 0:
+            del self._data[:excess]
+
+    def getvalue(self) -> bytes:
+        return bytes(self._data)
+
+
+async def run_process(
+    *args: str,
+    timeout: Optional[float] = None,
+    spawn: Optional[Callable[..., Awaitable[asyncio.subprocess.Process]]] = None,
+    clock: Callable[[], float] = time.monotonic,
+    stdout_sink: Optional[Callable[[bytes], None]] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> ProcessResult:
+    """Run a command in its own process group with bounded memory.
+
+    stdout and stderr are drained as they arrive into tail buffers (and
+    ``stdout_sink``, if given). After ``timeout`` seconds of ``clock``, or
+    when the awaiting task is cancelled, the whole process group is killed
+    so children such as ssh under rsync or wineserver go with it.
+    """
+    spawn = spawn or asyncio.create_subprocess_exec
+    proc = await spawn(
+        *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+        env=env,
+    )
+    started = time.monotonic()
+    stdout, stderr = _TailBuffer(), _TailBuffer()
+
+    async def drain(
+        stream: asyncio.StreamReader,
+        buffer: _TailBuffer,
+        sink: Optional[Callable[[bytes], None]],
+    ) -> None:
+        while True:
+            chunk = await stream.read(PIPE_READ_SIZE)
+            if not chunk:
+                return
+            buffer.write(chunk)
+            if sink:
+                sink(chunk)
+
+    async def finish() -> None:
+        await asyncio.gather(
+            drain(proc.stdout, stdout, stdout_sink), drain(proc.stderr, stderr, None)
+        )
+        await proc.wait()
+
+    completion = asyncio.ensure_future(finish())
+    timed_out = False
+    try:
+        if not timeout:
+            await asyncio.shield(completion)
+        else:
+            deadline = clock() + timeout
+            while not completion.done():
+                remaining = deadline - clock()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                # Re-check the deadline: the clock may not have advanced
+                # (a paused process group does not use up its timeout)
+                await asyncio.wait({completion}, timeout=remaining)
+    except asyncio.CancelledError:
+        _kill_group(proc)
+        await asyncio.shield(completion)
+        raise
+    if timed_out:
+        _kill_group(proc)
+        await completion
+    return ProcessResult(
+        list(args),
+        proc.returncode,
+        time.monotonic() - started,
+        stdout.getvalue(),
+        stderr.getvalue(),
+        timed_out,
+    )
+
+
+def _kill_group(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        proc.kill()
+
+
+class MirrorPool:
+    """Health scores for remote hosts, persisted between sessions.
+
+    Latency and throughput are exponentially weighted averages of background
+    probes; failures on real transfers count against a host until it succeeds
+    again. ``ranked`` orders hosts by the expected time to move 64 MiB.
+    """
+
+    SMOOTHING = 0.3
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._health: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    self._health = json.load(handle)
+            except (OSError, ValueError) as err:
+                decky.logger.warning(f"[Deckyfin] Ignoring mirror health file: {err}")
+
+    def snapshot(self, hosts: List[str]) -> List[Dict[str, Any]]:
+        return [{"host": host, **self._health.get(host, {})} for host in hosts]
+
+    def ranked(self, hosts: List[str]) -> List[str]:
+        def score(host: str) -> Tuple[bool, bool, float]:
+            health = self._health.get(host, {})
+            failures = health.get("failures", 0)
+            latency = health.get("latency", 0.5)
+            throughput = health.get("throughput") or 1024 * 1024
+            return (
+                failures >= MIRROR_FAILURE_LIMIT,
+                failures > 0,
+                latency + 64 * 1024 * 1024 / throughput,
+            )
+
+        # sorted() is stable, so unprobed hosts keep their configured order
+        return sorted(hosts, key=score)
+
+    def record_success(
+        self,
+        host: str,
+        latency: Optional[float] = None,
+        throughput: Optional[float] = None,
+    ) -> None:
+        health = self._health.setdefault(host, {})
+        for key, value in (("latency", latency), ("throughput", throughput)):
+            if value is None:
+                continue
+            previous = health.get(key)
+            health[key] = (
+                value
+                if previous is None
+                else previous + self.SMOOTHING * (value - previous)
+            )
+        health["failures"] = 0
+        health["last_ok"] = _now_iso()
+        self._save()
+
+    def record_failure(self, host: str, error: str) -> None:
+        health = self._health.setdefault(host, {})
+        health["failures"] = health.get("failures", 0) + 1
+        health["last_error"] = error[-500:]
+        health["last_failure"] = _now_iso()
+        self._save()
+
+    async def probe(self, host: str) -> None:
+        """Time an SSH round trip and a small bulk read from ``host``."""
+        try:
+            started = time.monotonic()
+            await self._ssh(host, "true")
+            latency = time.monotonic() - started
+
+            started = time.monotonic()
+            received = await self._ssh(host, f"head -c {PROBE_PAYLOAD_BYTES} /dev/zero")
+            elapsed = max(time.monotonic() - started - latency, 1e-3)
+        except Exception as err:  # pylint: disable=broad-except
+            self.record_failure(host, str(err))
+            return
+        self.record_success(host, latency=latency, throughput=received / elapsed)
+
+    async def _ssh(self, host: str, command: str) -> int:
+        # Probes bypass the governor so they measure the host, not our nice level
+        received = 0
+
+        def count(chunk: bytes) -> None:
+            nonlocal received
+            received += len(chunk)
+
+        result = await run_process(
+            "ssh", *SSH_PROBE_OPTIONS, host, command, timeout=30, stdout_sink=count
+        )
+        if not result.ok:
+            raise RuntimeError(result.describe())
+        return received
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._health, handle, indent=2)
+        os.replace(tmp_path, self._path)
+
+
+class DiskUsageIndex:
+    """Cached per-directory disk usage, refreshed incrementally.
+
+    Each directory remembers its mtime, the bytes allocated to the files
+    directly inside it and its subdirectories. A refresh walks the tree with
+    an explicit stack and only rescans a directory when its mtime changed
+    (entries were added or removed) or, when ``max_age`` is given, the entry
+    is older than that (files grew in place).
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._dirs: Dict[str, Dict[str, Any]] = {}
+        self._totals: Dict[str, int] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    self._dirs = json.load(handle)
+            except (OSError, ValueError):
+                self._dirs = {}
+
+    def refresh(self, roots: List[str], max_age: Optional[float] = None) -> None:
+        now = time.time()
+        for root in roots:
+            if not os.path.isdir(root):
+                continue
+            visited: Set[str] = set()
+            stack = [root]
+            while stack:
+                current = stack.pop()
+                visited.add(current)
+                try:
+                    mtime = os.stat(current).st_mtime_ns
+                except OSError:
+                    continue
+                cached = self._dirs.get(current)
+                if (
+                    cached is None
+                    or cached["mtime"] != mtime
+                    or (max_age is not None and now - cached["scanned"] > max_age)
+                ):
+                    cached = self._scan(current, mtime, now)
+                    self._dirs[current] = cached
+                stack.extend(cached["children"])
+            prefix = os.path.join(root, "")
+            for path in [p for p in self._dirs if p.startswith(prefix) or p == root]:
+                if path not in visited:
+                    del self._dirs[path]
+        self._totals = {}
+        self._save()
+
+    def total(self, path: str) -> int:
+        """Bytes used below ``path`` (a file, a directory or missing)."""
+        if path not in self._dirs:
+            try:
+                stat = os.lstat(path)
+            except OSError:
+                return 0
+            return stat.st_blocks * 512 if not os.path.isdir(path) else 0
+        if path in self._totals:
+            return self._totals[path]
+        # Iterative post-order so deep prefixes cannot hit the recursion limit
+        order: List[str] = []
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            if current in self._totals or current not in self._dirs:
+                continue
+            order.append(current)
+            stack.extend(self._dirs[current]["children"])
+        for current in reversed(order):
+            entry = self._dirs[current]
+            self._totals[current] = entry["files"] + sum(
+                self._totals.get(child, 0) for child in entry["children"]
+            )
+        return self._totals[path]
+
+    @staticmethod
+    def _scan(path: str, mtime: int, now: float) -> Dict[str, Any]:
+        files = 0
+        children: List[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            children.append(entry.path)
+                        else:
+                            files += entry.stat(follow_symlinks=False).st_blocks * 512
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return {"mtime": mtime, "scanned": now, "files": files, "children": children}
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self._dirs, handle)
+        os.replace(tmp_path, self._path)
+
+
+class ResourceGovernor:
+    """Run Deckyfin's subprocesses at low priority and yield to running games.
+
+    Commands are wrapped in ``nice``/``ionice`` so every child (ssh under
+    rsync, wine under protontricks) inherits the lower priority. Each process
+    gets its own process group. While a Steam game is running, background
+    groups are either paused with SIGSTOP (``whileGaming: "pause"``) or
+    duty-cycled between SIGCONT and SIGSTOP (``"throttle"``), and new rsync
+    transfers get ``--bwlimit``. Interactive commands (``background=False``)
+    keep the low priority but are never held back. Everything resumes at
+    full speed once the game exits.
+    """
+
+    def __init__(self, settings: Callable[[], Dict[str, Any]]) -> None:
+        self._settings = settings
+        self._processes: Set[asyncio.subprocess.Process] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._stopped = False
+        self._ionice = shutil.which("ionice")
+        self._paused_total = 0.0
+        self._paused_since: Optional[float] = None
+        self.pause_count = 0
+
+    @property
+    def gaming(self) -> bool:
+        return not self._idle.is_set()
+
+    def rsync_flags(self) -> List[str]:
+        options = self._settings()
+        if not options.get("enabled") or not self.gaming:
+            return []
+        if options.get("whileGaming") != "throttle":
+            return []
+        return [f"--bwlimit={int(options.get('bwlimitKbps', 2000))}"]
+
+    def active_clock(self) -> float:
+        """Monotonic time that stands still while governed processes are paused."""
+        now = time.monotonic()
+        paused = self._paused_total
+        if self._paused_since is not None:
+            paused += now - self._paused_since
+        return now - paused
+
+    async def execute(
+        self,
+        *args: str,
+        timeout: Optional[float] = None,
+        background: bool = True,
+        **kwargs: Any,
+    ) -> ProcessResult:
+        """:func:`run_process` under the governor's policy.
+
+        Time spent paused for a running game does not count towards
+        ``timeout``.
+        """
+        return await run_process(
+            *args,
+            timeout=timeout,
+            spawn=functools.partial(self.spawn, background=background),
+            clock=self.active_clock,
+            **kwargs,
+        )
+
+    async def spawn(
+        self, *args: str, background: bool = True, **kwargs: Any
+    ) -> asyncio.subprocess.Process:
+        """``asyncio.create_subprocess_exec`` under the governor's policy.
+
+        Only ``background`` processes wait for, and are stopped during, a
+        running game; interactive ones just run at low priority.
+        """
+        options = self._settings()
+        kwargs.setdefault("start_new_session", True)
+        if not options.get("enabled"):
+            return await asyncio.create_subprocess_exec(*args, **kwargs)
+        if shutil.which(args[0]) is None:
+            # The nice wrapper would hide a missing binary behind exit code 127
+            raise FileNotFoundError(args[0])
+        if background and options.get("whileGaming") == "pause":
+            await self._idle.wait()
+
+        command = ["nice", "-n", str(int(options.get("nice", 10)))]
+        io_class = IONICE_CLASSES.get(options.get("ioClass", "idle"))
+        if self._ionice and io_class:
+            command.extend([self._ionice, "-c", str(io_class)])
+        proc = await asyncio.create_subprocess_exec(*command, *args, **kwargs)
+        if background:
+            self._processes.add(proc)
+            asyncio.get_event_loop().create_task(self._forget(proc))
+        return proc
+
+    async def run(self) -> None:
+        """Watch for running games and pause or throttle governed processes."""
+        while True:
+            gaming = await asyncio.to_thread(self._steam_game_running)
+            if gaming and not self.gaming:
+                decky.logger.info("[Deckyfin] Game running, backing off transfers")
+                self._idle.clear()
+            elif not gaming and self.gaming:
+                decky.logger.info("[Deckyfin] Game exited, resuming transfers")
+                self._idle.set()
+                self._signal_all(signal.SIGCONT)
+
+            options = self._settings()
+            mode = options.get("whileGaming", "pause")
+            pausing = self.gaming and options.get("enabled") and mode == "pause"
+            self._track_pause(bool(pausing))
+            if not self.gaming or not options.get("enabled") or mode == "ignore":
+                await asyncio.sleep(GAMING_POLL_SECONDS)
+            elif mode == "pause":
+                self._signal_all(signal.SIGSTOP)
+                await asyncio.sleep(GAMING_POLL_SECONDS)
+            else:
+                duty = min(max(float(options.get("throttleDuty", 0.25)), 0.05), 1.0)
+                cycles = max(int(GAMING_POLL_SECONDS / THROTTLE_PERIOD_SECONDS), 1)
+                for _ in range(cycles):
+                    self._signal_all(signal.SIGCONT)
+                    await asyncio.sleep(THROTTLE_PERIOD_SECONDS * duty)
+                    self._signal_all(signal.SIGSTOP)
+                    await asyncio.sleep(THROTTLE_PERIOD_SECONDS * (1 - duty))
+
+    def release(self) -> None:
+        """Let every governed process run again, e.g. when unloading."""
+        self._idle.set()
+        self._track_pause(False)
+        self._signal_all(signal.SIGCONT)
+
+    def _track_pause(self, pausing: bool) -> None:
+        if pausing and self._paused_since is None:
+            self._paused_since = time.monotonic()
+            self.pause_count += 1
+        elif not pausing and self._paused_since is not None:
+            self._paused_total += time.monotonic() - self._paused_since
+            self._paused_since = None
+
+    async def _forget(self, proc: asyncio.subprocess.Process) -> None:
+        await proc.wait()
+        self._processes.discard(proc)
+
+    def _signal_all(self, signum: int) -> None:
+        for proc in list(self._processes):
+            if proc.returncode is not None:
+                continue
+            try:
+                os.killpg(proc.pid, signum)
+            except ProcessLookupError:
+                self._processes.discard(proc)
+
+    @staticmethod
+    def _steam_game_running() -> bool:
+        # Steam launches every game through its reaper with "SteamLaunch AppId=N"
+        try:
+            pids = [name for name in os.listdir("/proc") if name.isdigit()]
+        except OSError:
+            return False
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/cmdline", "rb") as handle:
+                    cmdline = handle.read()
+            except OSError:
+                continue
+            if b"SteamLaunch" in cmdline and b"AppId=" in cmdline:
+                return True
+        return False
+
+
+class SteamAccounts:
+    """Steam accounts on this device and where their shortcuts live.
+
+    ``loginusers.vdf`` is parsed once and the result is cached until
+    :meth:`invalidate` is called, which the plugin does whenever the file
+    changes. The most recently logged-in account comes first. Without a
+    readable ``loginusers.vdf`` the numeric ``userdata`` folders are used
+    instead.
+    """
+
+    def __init__(self, steam_root: str) -> None:
+        self.loginusers_path = os.path.join(steam_root, "config", "loginusers.vdf")
+        self.userdata_path = os.path.join(steam_root, "userdata")
+        self._accounts: Optional[List[Dict[str, Any]]] = None
+
+    def invalidate(self) -> None:
+        self._accounts = None
+
+    def active(self) -> Optional[Dict[str, Any]]:
+        accounts = self.accounts()
+        return accounts[0] if accounts else None
+
+    def accounts(self) -> List[Dict[str, Any]]:
+        """``[{account_id, persona, shortcuts}]``, the active account first."""
+        if self._accounts is None:
+            self._accounts = self._from_loginusers() or self._from_userdata()
+            if self._accounts:
+                active = self._accounts[0]
+                decky.logger.info(
+                    f"[Deckyfin] Active Steam account {active['persona']} "
+                    f"({active['account_id']})"
+                )
+        return self._accounts
+
+    def _from_loginusers(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.loginusers_path, "r", encoding="utf-8") as handle:
+                users = vdf.load(handle).get("users", {})
+        except (OSError, SyntaxError, ValueError) as err:
+            decky.logger.info(f"[Deckyfin] Could not read loginusers.vdf: {err}")
+            return []
+        ranked: List[Tuple[bool, int, Dict[str, Any]]] = []
+        for steam_id, fields in users.items():
+            if not steam_id.isdigit() or not isinstance(fields, dict):
+                continue
+            # Older clients write these keys in lower case
+            fields = {key.lower(): value for key, value in fields.items()}
+            account_id = str(int(steam_id) - STEAM_ID64_BASE)
+            ranked.append(
+                (
+                    str(fields.get("mostrecent", "0")) == "1",
+                    int(fields.get("timestamp", 0) or 0),
+                    self._account(account_id, fields.get("personaname", "")),
+                )
+            )
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [account for _recent, _timestamp, account in ranked]
+
+    def _from_userdata(self) -> List[Dict[str, Any]]:
+        try:
+            names = sorted(os.listdir(self.userdata_path))
+        except OSError:
+            return []
+        return [self._account(name, "") for name in names if name.isdigit()]
+
+    def _account(self, account_id: str, persona: str) -> Dict[str, Any]:
+        return {
+            "account_id": account_id,
+            "persona": persona or account_id,
+            "shortcuts": os.path.join(
+                self.userdata_path, account_id, "config", "shortcuts.vdf"
+            ),
+        }
+
+
+class PeerServer:
+    """Serve installed games to other Deckyfin devices on the LAN.
+
+    A small HTTP/1.0 endpoint exposes ``/games`` (the slugs on offer),
+    ``/games/<slug>`` (size, mtime and SHA-256 of every file, taken from the
+    install manifest) and ``/games/<slug>/<path>`` (file content). Only files
+    listed in a manifest are ever served. A UDP responder answers discovery
+    broadcasts with the HTTP port and the slugs on offer.
+    """
+
+    def __init__(
+        self,
+        games: Callable[[], Dict[str, Tuple[str, Dict[str, Dict[str, Any]]]]],
+        busy: Callable[[], bool],
+        port: int,
+        discovery_port: int,
+    ) -> None:
+        self._games = games
+        self._busy = busy
+        self.port = port
+        self._discovery_port = discovery_port
+        self.instance = uuid.uuid4().hex
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._responder: Optional[asyncio.DatagramTransport] = None
+
+    async def start(self) -> None:
+        loop = asyncio.get_event_loop()
+        self._server = await asyncio.start_server(self._handle, "0.0.0.0", self.port)
+        try:
+            self._responder, _protocol = await loop.create_datagram_endpoint(
+                lambda: _DiscoveryResponder(self),
+                local_addr=("0.0.0.0", self._discovery_port),
+                reuse_port=True,
+                allow_broadcast=True,
+            )
+        except OSError as err:
+            decky.logger.warning(f"[Deckyfin] Peer discovery unavailable: {err}")
+        decky.logger.info(f"[Deckyfin] Serving games to peers on port {self.port}")
+
+    async def stop(self) -> None:
+        if self._responder:
+            self._responder.close()
+            self._responder = None
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def announcement(self) -> bytes:
+        return json.dumps(
+            {"id": self.instance, "port": self.port, "games": sorted(self._games())}
+        ).encode("utf-8")
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            # One deadline for the whole request head, so a stalled client
+            # cannot hold a connection open
+            request = await asyncio.wait_for(
+                self._read_head(reader), PEER_TIMEOUT_SECONDS
+            )
+            method, _, rest = request.decode("latin-1").partition(" ")
+            target = urllib.parse.unquote(rest.split(" ", 1)[0])
+            if method != "GET":
+                await self._respond(writer, 405, b"")
+            elif self._busy():
+                # A game is running here; let the requester use another source
+                await self._respond(writer, 503, b"")
+            else:
+                await self._route(writer, target.strip("/").split("/", 2))
+        except (asyncio.TimeoutError, OSError, ValueError) as err:
+            # ValueError covers request lines over the stream's size limit
+            decky.logger.info(f"[Deckyfin] Peer request dropped: {err}")
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> bytes:
+        """The request line, after reading past the headers that follow it."""
+        request = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        return request
+
+    async def _route(self, writer: asyncio.StreamWriter, parts: List[str]) -> None:
+        games = self._games()
+        if parts == ["games"]:
+            await self._respond_json(writer, sorted(games))
+            return
+        if len(parts) < 2 or parts[0] != "games" or parts[1] not in games:
+            await self._respond(writer, 404, b"")
+            return
+        root, files = games[parts[1]]
+        if len(parts) == 2:
+            await self._respond_json(writer, {"files": files})
+            return
+        if parts[2] not in files:
+            await self._respond(writer, 404, b"")
+            return
+        path = os.path.join(root, *parts[2].split("/"))
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size != files[parts[2]]["size"]:
+                # Changed since the table was built; do not serve a stale file
+                await self._respond(writer, 404, b"")
+                return
+            writer.write(
+                f"HTTP/1.0 200 OK\r\nContent-Length: {size}\r\n\r\n".encode("latin-1")
+            )
+            await asyncio.get_event_loop().sendfile(writer.transport, handle)
+        await writer.drain()
+
+    async def _respond_json(self, writer: asyncio.StreamWriter, payload: Any) -> None:
+        await self._respond(writer, 200, json.dumps(payload).encode("utf-8"))
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: bytes) -> None:
+        writer.write(
+            f"HTTP/1.0 {status} Deckyfin\r\nContent-Length: {len(body)}\r\n\r\n".encode(
+                "latin-1"
+            )
+            + body
+        )
+        await writer.drain()
+
+
+class _DiscoveryResponder(asyncio.DatagramProtocol):
+    def __init__(self, server: PeerServer) -> None:
+        self._server = server
+        self._transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        if data == PEER_DISCOVERY_MESSAGE and self._transport:
+            self._transport.sendto(self._server.announcement(), addr)
+
+
+class _DiscoveryCollector(asyncio.DatagramProtocol):
+    def __init__(self) -> None:
+        self.replies: List[Tuple[str, Dict[str, Any]]] = []
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            reply = json.loads(data)
+        except ValueError:
+            return
+        if isinstance(reply, dict):
+            self.replies.append((addr[0], reply))
+
+
+async def discover_peers(
+    discovery_port: int, addresses: Optional[List[str]] = None
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Broadcast a discovery query and collect ``(address, announcement)``."""
+    loop = asyncio.get_event_loop()
+    transport, collector = await loop.create_datagram_endpoint(
+        _DiscoveryCollector, local_addr=("0.0.0.0", 0), allow_broadcast=True
+    )
+    try:
+        for address in addresses or ["255.255.255.255"]:
+            transport.sendto(PEER_DISCOVERY_MESSAGE, (address, discovery_port))
+        await asyncio.sleep(PEER_DISCOVERY_SECONDS)
+    finally:
+        transport.close()
+    return collector.replies
+
+
+async def _peer_get(
+    host: str, port: int, path: str
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, int]:
+    """Send a GET to a peer and return the open stream and Content-Length."""
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port), PEER_TIMEOUT_SECONDS
+    )
+    writer.write(
+        f"GET {urllib.parse.quote(path)} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode(
+            "latin-1"
+        )
+    )
+    await writer.drain()
+    status = await asyncio.wait_for(reader.readline(), PEER_TIMEOUT_SECONDS)
+    length = -1
+    while True:
+        line = await asyncio.wait_for(reader.readline(), PEER_TIMEOUT_SECONDS)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    code = status.split(b" ")[1] if status.count(b" ") else b""
+    if code != b"200":
+        writer.close()
+        raise RuntimeError(f"peer {host}:{port} answered {status.decode().strip()}")
+    return reader, writer, length
+
+
+async def fetch_peer_json(host: str, port: int, path: str) -> Any:
+    reader, writer, length = await _peer_get(host, port, path)
+    try:
+        body = await asyncio.wait_for(
+            reader.readexactly(length) if length >= 0 else reader.read(),
+            PEER_TIMEOUT_SECONDS,
+        )
+    finally:
+        writer.close()
+    return json.loads(body)
+
+
+def _peer_listing(listing: Any) -> Dict[str, Dict[str, Any]]:
+    """The ``files`` of a peer's game listing, raising ``ValueError`` if malformed."""
+    files = listing.get("files") if isinstance(listing, dict) else None
+    if not isinstance(files, dict):
+        raise ValueError("peer listing has no 'files' object")
+    for relative, entry in files.items():
+        if (
+            not isinstance(entry, dict)
+            or not isinstance(entry.get("size"), int)
+            or isinstance(entry.get("size"), bool)
+            or not isinstance(entry.get("mtime"), (int, float))
+            or not isinstance(entry.get("sha256"), str)
+            or len(entry["sha256"]) != 64
+        ):
+            raise ValueError(f"peer listing entry for {relative!r} is malformed")
+        parts = relative.split("/")
+        if relative.startswith("/") or ".." in parts:
+            raise ValueError(f"peer offered unsafe path {relative}")
+    return files
+
+
+async def download_from_peer(
+    host: str,
+    port: int,
+    slug: str,
+    destination: str,
+    expected: Optional[Dict[str, str]] = None,
+) -> Tuple[int, List[str]]:
+    """Copy a served game into ``destination``, verifying every file's hash.
+
+    ``expected`` maps paths to the SHA-256 the remote host published; when
+    given, only those files are copied and they are checked against it
+    instead of the hash the peer claims. Files are written next to their
+    target and renamed once their hash matches, keeping the peer's mtimes so
+    a later rsync sees them as current. Returns the number of bytes received
+    and the files now in ``destination`` that came from the peer.
+    """
+    files = _peer_listing(await fetch_peer_json(host, port, f"/games/{slug}"))
+    if expected is not None:
+        # A file the peer hashes differently from the host would fail anyway
+        files = {
+            relative: entry
+            for relative, entry in files.items()
+            if expected.get(relative) == entry["sha256"]
+        }
+    received = 0
+    limit = asyncio.Semaphore(PEER_DOWNLOADS)
+
+    async def fetch(relative: str, entry: Dict[str, Any]) -> None:
+        nonlocal received
+        target = os.path.join(destination, *relative.split("/"))
+        if os.path.isfile(target) and os.path.getsize(target) == entry["size"]:
+            return
+        async with limit:
+            reader, writer, _length = await _peer_get(
+                host, port, f"/games/{slug}/{relative}"
+            )
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            part_path = f"{target}.deckyfin-part"
+            digest = hashlib.sha256()
+            try:
+                with open(part_path, "wb") as handle:
+                    while True:
+                        chunk = await asyncio.wait_for(
+                            reader.read(PEER_CHUNK_SIZE), PEER_TIMEOUT_SECONDS
+                        )
+                        if not chunk:
+                            break
+                        digest.update(chunk)
+                        handle.write(chunk)
+                        received += len(chunk)
+                wanted = expected[relative] if expected is not None else entry["sha256"]
+                if digest.hexdigest() != wanted:
+                    raise RuntimeError(f"{relative} failed verification")
+                os.utime(part_path, (entry["mtime"], entry["mtime"]))
+                os.replace(part_path, target)
+            except BaseException:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+            finally:
+                writer.close()
+
+    tasks = [
+        asyncio.ensure_future(fetch(relative, entry))
+        for relative, entry in files.items()
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the other transfers before the caller moves on to the next source
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return received, list(files)
+
+
 class Plugin:
     def __init__(self) -> None:
         os.makedirs(DATA_DIR, exist_ok=True)
         os.makedirs(SAVES_DIR, exist_ok=True)
         self.settings: Dict[str, Any] = self._load_settings()
         self._cached_games: List[Dict[str, Any]] = []
+        # Entries the catalog rejected; their prefixes and backups are kept
+        self._rejected_games: List[Dict[str, Any]] = []
         self._config_saves_path: str = ""
+        self._save_watcher: Optional[SaveWatcher] = None
+        self._journal = OperationJournal(JOURNAL_PATH)
+        self._mirrors = MirrorPool(MIRROR_HEALTH_PATH)
+        self._probe_task: Optional[asyncio.Task] = None
+        self._disk_usage = DiskUsageIndex(DISK_USAGE_PATH)
+        self._disk_lock = asyncio.Lock()
+        self._index_task: Optional[asyncio.Task] = None
+        self._governor = ResourceGovernor(lambda: self.settings.get("governor") or {})
+        self._governor_task: Optional[asyncio.Task] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._steam_accounts = SteamAccounts(STEAM_ROOT)
+        self._steam_watcher: Optional[SaveWatcher] = None
+        self._peer_server: Optional[PeerServer] = None
+        # Slug -> (name, folder, files) of games on offer, rebuilt on change
+        self._served: Optional[
+            Dict[str, Tuple[str, str, Dict[str, Dict[str, Any]]]]
+        ] = None
+        # Games changed in place outside the journal (updates and repairs)
+        self._busy_games: Set[str] = set()
         self.loop = asyncio.get_event_loop()
 
     # region lifecycle -----------------------------------------------------
     async def _main(self):
         decky.logger.info("[Deckyfin] Plugin starting up")
+        if self._journal.unfinished():
+            self.loop.create_task(self._recover_jobs())
+        self._probe_task = self.loop.create_task(self._probe_mirrors())
+        self._index_task = self.loop.create_task(self._index_disk_usage())
+        self._governor_task = self.loop.create_task(self._governor.run())
+        self._prefetch_task = self.loop.create_task(self._prefetch_loop())
+        self._watch_steam_accounts()
+        await self._configure_save_watcher()
+        await self._configure_peer_server()
 
     async def _unload(self):
         decky.logger.info("[Deckyfin] Plugin unloading")
+        if self._probe_task:
+            self._probe_task.cancel()
+            self._probe_task = None
+        if self._index_task:
+            self._index_task.cancel()
+            self._index_task = None
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+        if self._governor_task:
+            self._governor_task.cancel()
+            self._governor_task = None
+            self._governor.release()
+        if self._save_watcher:
+            await self._save_watcher.stop()
+            self._save_watcher = None
+        if self._steam_watcher:
+            await self._steam_watcher.stop()
+            self._steam_watcher = None
+        if self._peer_server:
+            await self._peer_server.stop()
+            self._peer_server = None
 
     async def _uninstall(self):
         decky.logger.info("[Deckyfin] Plugin uninstall requested")
@@ -101,11 +1990,26 @@ class Plugin:
         return self.settings
 
     async def save_settings(self, new_settings: Dict[str, Any]) -> Dict[str, Any]:
+        mirrors = new_settings.get("mirrorHosts")
+        if isinstance(mirrors, str):
+            new_settings["mirrorHosts"] = mirrors.replace(",", " ").split()
+        peers = new_settings.get("peers") or {}
+        if isinstance(peers.get("hosts"), str):
+            peers["hosts"] = peers["hosts"].replace(",", " ").split()
         self.settings = self._deep_merge(self.settings, new_settings)
         self._persist_settings()
         decky.logger.info("[Deckyfin] Settings saved")
+        await self._configure_save_watcher()
+        await self._configure_peer_server()
         return self.settings
 
+    async def get_mirror_status(self) -> Dict[str, Any]:
+        hosts = self._remote_hosts()
+        return {
+            "hosts": self._mirrors.snapshot(self._mirrors.ranked(hosts)),
+            "refreshedAt": _now_iso(),
+        }
+
     # endregion -----------------------------------------------------------
 
     # region games api ----------------------------------------------------
@@ -115,11 +2019,16 @@ class Plugin:
         games_list = config_data["games"]
         decorated = [self._decorate_game(entry) for entry in games_list]
         self._cached_games = decorated
+        self._served = None
+        self._rejected_games = config_data["rejected"]
         self._config_saves_path = config_data.get("savesPath", "")
+        if self._save_watcher:
+            self._save_watcher.update_targets(self._save_watch_targets())
         return {
             "games": decorated,
             "source": config_path,
             "savesPath": self._config_saves_path,
+            "errors": config_data["errors"],
             "refreshedAt": _now_iso(),
         }
 
@@ -176,15 +2085,15 @@ class Plugin:
                     env["WINEPREFIX"] = pfx
                     env["WINEARCH"] = "win64"
 
-                    proc = await asyncio.create_subprocess_exec(
+                    result = await self._governor.execute(
                         proton_wine,
                         "wineboot",
                         "--init",
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
+                        timeout=self._timeout("wineboot"),
                         env=env,
                     )
-                    await proc.communicate()
+                    if result.timed_out:
+                        decky.logger.warning(f"[Deckyfin] {result.describe()}")
                     # wineboot may return non-zero, that's okay for initialization
             else:
                 decky.logger.warning(
@@ -195,15 +2104,15 @@ class Plugin:
             decky.logger.warning(f"Failed to initialize prefix with Proton: {e}")
             # Continue anyway - structure is created
 
-        # Store metadata
-        metadata = {
-            "name": game["name"],
-            "proton_version": proton_version,
-            "updated_at": _now_iso(),
-        }
-        metadata_path = os.path.join(prefix_path, "deckyfin.json")
-        with open(metadata_path, "w", encoding="utf-8") as handle:
-            json.dump(metadata, handle, indent=2)
+        # Store metadata, keeping fields such as the installed game version
+        self._write_prefix_metadata(
+            prefix_path,
+            {
+                "name": game["name"],
+                "proton_version": proton_version,
+                "updated_at": _now_iso(),
+            },
+        )
 
         return {
             "ok": True,
@@ -225,6 +2134,7 @@ class Plugin:
         os.makedirs(backup_root, exist_ok=True)
 
         copied = []
+        packed_sources: List[Tuple[str, str]] = []
         for relative in sync_paths:
             resolved = self._resolve_proton_path(prefix_path, relative)
             if not os.path.exists(resolved):
@@ -232,10 +2142,24 @@ class Plugin:
                     "[Deckyfin] Save path missing for %s: %s", game_name, relative
                 )
                 continue
+            if game.get("save_mode") == "packed":
+                packed_sources.append((resolved, self._save_archive_root(relative)))
+                continue
             target = os.path.join(backup_root, self._sanitize_relative(relative))
             self._copy_any(resolved, target)
             copied.append(target)
 
+        if packed_sources:
+            archive_path = os.path.join(backup_root, PACKED_SAVE_ARCHIVE)
+            index = await asyncio.to_thread(
+                pack_save_archive, packed_sources, archive_path
+            )
+            with open(
+                os.path.join(backup_root, PACKED_SAVE_INDEX), "w", encoding="utf-8"
+            ) as handle:
+                json.dump(index, handle, indent=2)
+            copied.append(archive_path)
+
         if not copied:
             raise RuntimeError(
                 f"No save paths for {game_name} were copied. Ensure the prefix exists."
@@ -254,10 +2178,21 @@ class Plugin:
             await self._rsync_directory(
                 remote_target, backup_root, upload=True, delete=False
             )
+            self._mark_uploaded(backup_root)
+
+        message = f"Saves for {game_name} copied to {backup_root}"
+        if game.get("shader_cache_path") and remote_host:
+            try:
+                uploaded = await self._push_shader_cache(game)
+                message += f", {uploaded} shader cache files shared"
+            except Exception as err:  # pylint: disable=broad-except
+                decky.logger.warning(
+                    f"[Deckyfin] Shader cache sync failed for {game_name}: {err}"
+                )
 
         return {
             "ok": True,
-            "message": f"Saves for {game_name} copied to {backup_root}",
+            "message": message,
             "timestamp": _now_iso(),
         }
 
@@ -292,140 +2227,1429 @@ class Plugin:
         if not remote_host:
             raise RuntimeError("Remote host is not configured")
 
-        steps = []
+        # remote_path in the catalog is relative to the remote config directory
+        remote_path = game.get("remote_path", "")
+        if not remote_path:
+            raise RuntimeError(
+                "Game entry must have a 'path' field specifying remote location"
+            )
+        remote_games_base = os.path.dirname(self.settings.get("remoteConfigPath", ""))
+        # Local path is always in the configured local games folder, using game name
+        local_target = os.path.join(
+            self.settings["localGamesPath"], _slugify(game_name)
+        )
+
+        job = self._journal.begin(
+            "install",
+            game_name,
+            self._install_steps(game, remote_games_base, local_target),
+        )
+        steps = await self._run_job(job)
+
+        # Refresh cache
+        await self.load_games()
+
+        return {
+            "ok": True,
+            "message": f"Game '{game_name}' installed successfully",
+            "steps": steps,
+            "timestamp": _now_iso(),
+        }
+
+    async def remove_game(self, game_name: str) -> Dict[str, Any]:
+        """Remove game: backup saves, delete files, remove from Steam."""
+        game = await self._require_game_by_name(game_name)
+
+        if not game.get("installed"):
+            raise RuntimeError(f"Game '{game_name}' is not installed")
+
+        job = self._journal.begin("remove", game_name, self._remove_steps(game))
+        steps = await self._run_job(job)
+
+        # Refresh cache
+        await self.load_games()
+
+        return {
+            "ok": True,
+            "message": f"Game '{game_name}' removed successfully",
+            "steps": steps,
+            "timestamp": _now_iso(),
+        }
+
+    async def install_games(self, game_names: List[str]) -> Dict[str, Any]:
+        """Install several games with one rsync session and one shortcuts.vdf write."""
+        games = [
+            await self._require_game_by_name(name) for name in dict.fromkeys(game_names)
+        ]
+        installed = [game["name"] for game in games if game.get("installed")]
+        if installed:
+            raise RuntimeError(f"Already installed: {', '.join(installed)}")
+
+        remote_host = self.settings.get("remoteHost", "").strip()
+        if not remote_host:
+            raise RuntimeError("Remote host is not configured")
+        missing = [game["name"] for game in games if not game.get("remote_path")]
+        if missing:
+            raise RuntimeError(
+                f"Game entries without a remote 'path': {', '.join(missing)}"
+            )
+
+        remote_games_base = os.path.dirname(self.settings.get("remoteConfigPath", ""))
+        jobs = [
+            self._journal.begin(
+                "install",
+                game["name"],
+                self._install_steps(
+                    game,
+                    remote_games_base,
+                    os.path.join(
+                        self.settings["localGamesPath"], _slugify(game["name"])
+                    ),
+                ),
+            )
+            for game in games
+        ]
+
+        steps: List[str] = []
+        failures: List[str] = []
+
+        async def download(inputs: List[Dict[str, Any]]) -> str:
+            await self._batch_download(remote_games_base, inputs)
+            return "Downloaded game files"
+
+        async def add_shortcuts(inputs: List[Dict[str, Any]]) -> str:
+            await self._apply_steam_shortcuts(
+                add=[self._steam_shortcut_entry(**entry) for entry in inputs]
+            )
+            return "Added to Steam library"
+
+        jobs = await self._run_batch_step(
+            jobs, "download", steps, failures, batch=download
+        )
+        jobs = await self._run_batch_step(
+            jobs, "prefix", steps, failures, parallel=True
+        )
+        jobs = await self._run_batch_step(jobs, "shader_cache", steps, failures)
+        jobs = await self._run_batch_step(jobs, "manifest", steps, failures)
+        jobs = await self._run_batch_step(jobs, "dependencies", steps, failures)
+        jobs = await self._run_batch_step(jobs, "import_saves", steps, failures)
+        jobs = await self._run_batch_step(
+            jobs, "steam", steps, failures, batch=add_shortcuts
+        )
+        for job in jobs:
+            self._journal.finish(job, "done")
+
+        # Refresh cache once for the whole batch
+        await self.load_games()
+
+        return {
+            "ok": len(failures) == 0,
+            "message": f"Installed {len(jobs)} of {len(games)} games",
+            "steps": steps,
+            "failures": failures,
+            "timestamp": _now_iso(),
+        }
 
-        # Step 1: Download game files
+    async def remove_games(self, game_names: List[str]) -> Dict[str, Any]:
+        """Remove several games, applying all Steam shortcut removals in one write."""
+        games = [
+            await self._require_game_by_name(name) for name in dict.fromkeys(game_names)
+        ]
+        not_installed = [game["name"] for game in games if not game.get("installed")]
+        if not_installed:
+            raise RuntimeError(f"Not installed: {', '.join(not_installed)}")
+
+        jobs = [
+            self._journal.begin("remove", game["name"], self._remove_steps(game))
+            for game in games
+        ]
+
+        steps: List[str] = []
+        failures: List[str] = []
+
+        async def remove_shortcuts(inputs: List[Dict[str, Any]]) -> str:
+            try:
+                await self._apply_steam_shortcuts(
+                    remove=[entry["steam_appid"] for entry in inputs]
+                )
+            except Exception as e:
+                decky.logger.warning(f"Steam removal had issues: {e}")
+                return f"Steam removal warning: {e}"
+            return "Removed from Steam library"
+
+        jobs = await self._run_batch_step(jobs, "backup_saves", steps, failures)
+        jobs = await self._run_batch_step(
+            jobs, "steam", steps, failures, batch=remove_shortcuts
+        )
+        jobs = await self._run_batch_step(jobs, "game_folder", steps, failures)
+        jobs = await self._run_batch_step(jobs, "prefix", steps, failures)
+        for job in jobs:
+            self._journal.finish(job, "done")
+
+        # Refresh cache once for the whole batch
+        await self.load_games()
+
+        return {
+            "ok": len(failures) == 0,
+            "message": f"Removed {len(jobs)} of {len(games)} games",
+            "steps": steps,
+            "failures": failures,
+            "timestamp": _now_iso(),
+        }
+
+    async def verify_game(self, game_name: str) -> Dict[str, Any]:
+        """Check installed files against the game's manifest."""
+        game = await self._require_game_by_name(game_name)
+        if not game.get("installed"):
+            raise RuntimeError(f"Game '{game_name}' is not installed")
+        manifest = self._read_manifest(game)
+        expected: Dict[str, Dict[str, Any]] = manifest["files"]
+
+        missing: List[str] = []
+        candidates: List[str] = []
+        mismatched: List[str] = []
+        for relative, entry in expected.items():
+            path = os.path.join(game["path"], *relative.split("/"))
+            if not os.path.isfile(path):
+                missing.append(relative)
+            elif os.path.getsize(path) != entry["size"]:
+                # A size change already proves a mismatch, skip hashing it
+                mismatched.append(relative)
+            else:
+                candidates.append(relative)
+
+        actual = await asyncio.to_thread(hash_tree, game["path"], candidates)
+        mismatched.extend(
+            relative
+            for relative, entry in actual.items()
+            if entry["sha256"] != expected[relative]["sha256"]
+        )
+        mismatched.sort()
+
+        damaged = len(missing) + len(mismatched)
+        return {
+            "ok": damaged == 0,
+            "message": (
+                f"All {len(expected)} files of {game_name} match the manifest"
+                if damaged == 0
+                else f"{damaged} of {len(expected)} files of {game_name} need repair"
+            ),
+            "missing": missing,
+            "mismatched": mismatched,
+            "timestamp": _now_iso(),
+        }
+
+    async def repair_game(self, game_name: str) -> Dict[str, Any]:
+        """Re-download only the files that fail verification."""
+        report = await self.verify_game(game_name)
+        damaged = report["missing"] + report["mismatched"]
+        if not damaged:
+            return report
+
+        game = await self._require_game_by_name(game_name)
+        remote_games_base = os.path.dirname(self.settings.get("remoteConfigPath", ""))
+        remote_target = os.path.join(remote_games_base, game["remote_path"])
+        self._busy_games.add(game_name)
         try:
-            # path in config is the remote path relative to the games directory
-            remote_path = game.get("path", "")
-            if not remote_path:
-                raise RuntimeError(
-                    "Game entry must have a 'path' field specifying remote location"
+            # Damaged files can keep their size and mtime, so skip rsync's quick check
+            await self._rsync_file_list(
+                remote_target,
+                game["path"],
+                damaged,
+                download=True,
+                extra_flags=["--ignore-times"],
+            )
+        finally:
+            self._busy_games.discard(game_name)
+            self._served = None
+
+        report = await self.verify_game(game_name)
+        still_damaged = len(report["missing"]) + len(report["mismatched"])
+        return {
+            **report,
+            "message": (
+                f"Repaired {len(damaged)} files of {game_name}"
+                if still_damaged == 0
+                else f"{still_damaged} files of {game_name} still fail verification"
+            ),
+            "repaired": damaged,
+        }
+
+    async def update_game(self, game_name: str) -> Dict[str, Any]:
+        """Bring an installed game up to the remote version in place.
+
+        Only files whose hash differs from the installed manifest are
+        downloaded and files dropped from the game are deleted. The prefix,
+        saves and Steam shortcut are left alone. Peers are not served the
+        game while it changes.
+        """
+        game = await self._require_game_by_name(game_name)
+        if not game.get("installed"):
+            raise RuntimeError(f"Game '{game_name}' is not installed")
+        self._busy_games.add(game_name)
+        try:
+            return await self._apply_update(game)
+        finally:
+            self._busy_games.discard(game_name)
+
+    async def _apply_update(self, game: Dict[str, Any]) -> Dict[str, Any]:
+        game_name = game["name"]
+        remote_games_base = os.path.dirname(self.settings.get("remoteConfigPath", ""))
+        remote_target = os.path.join(remote_games_base, game["remote_path"])
+        target = await self._build_manifest(
+            remote_target, game["path"], game.get("version")
+        )
+        if target["source"] == "local":
+            raise RuntimeError(
+                f"Could not read the remote file list of {game_name}; is the host reachable?"
+            )
+
+        try:
+            current: Dict[str, Dict[str, Any]] = self._read_manifest(game)["files"]
+        except RuntimeError:
+            # Installed before manifests existed: compare against the files on disk
+            present = [
+                relative
+                for relative in target["files"]
+                if os.path.isfile(os.path.join(game["path"], *relative.split("/")))
+            ]
+            current = await asyncio.to_thread(hash_tree, game["path"], present)
+
+        changed = sorted(
+            relative
+            for relative, entry in target["files"].items()
+            if current.get(relative, {}).get("sha256") != entry["sha256"]
+            or not os.path.isfile(os.path.join(game["path"], *relative.split("/")))
+        )
+        # Only files the previous version shipped; never user-created ones
+        dropped = sorted(set(current) - set(target["files"]))
+
+        if changed:
+            # The list is already exact, skip rsync's size/mtime quick check
+            await self._rsync_file_list(
+                remote_target,
+                game["path"],
+                changed,
+                download=True,
+                extra_flags=["--ignore-times"],
+            )
+        for relative in dropped:
+            parts = relative.split("/")
+            if relative.startswith("/") or ".." in parts:
+                continue
+            try:
+                os.remove(os.path.join(game["path"], *parts))
+            except FileNotFoundError:
+                pass
+
+        # Written last, so an interrupted update is simply picked up again
+        self._write_manifest(os.path.join(game["prefix_path"], MANIFEST_NAME), target)
+        self._write_prefix_metadata(
+            game["prefix_path"], {"game_version": target["version"]}
+        )
+        await self.load_games()
+
+        version = f" to {target['version']}" if target["version"] else ""
+        return {
+            "ok": True,
+            "message": (
+                f"Updated {game_name}{version}: {len(changed)} files downloaded, "
+                f"{len(dropped)} removed"
+                if changed or dropped
+                else f"{game_name} is already up to date"
+            ),
+            "updated": changed,
+            "removed": dropped,
+            "timestamp": _now_iso(),
+        }
+
+    # endregion -----------------------------------------------------------
+
+    # region jobs ---------------------------------------------------------
+    def _install_steps(
+        self, game: Dict[str, Any], remote_games_base: str, local_target: str
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        executable = game.get("executable", "")
+        remote_target = os.path.join(remote_games_base, game["remote_path"])
+        return [
+            (
+                "download",
+                {
+                    "remote_target": remote_target,
+                    "local_target": local_target,
+                },
+            ),
+            (
+                "prefix",
+                {
+                    "steam_appid": game["steam_appid"],
+                    "prefix_path": game["prefix_path"],
+                },
+            ),
+            (
+                "shader_cache",
+                {
+                    "game_name": game["name"],
+                    "local_target": os.path.join(
+                        game["prefix_path"], PREFIX_SHADER_CACHE
+                    ),
+                },
+            ),
+            (
+                "manifest",
+                {
+                    "remote_target": remote_target,
+                    "local_target": local_target,
+                    "manifest_path": os.path.join(game["prefix_path"], MANIFEST_NAME),
+                    "version": game.get("version", ""),
+                },
+            ),
+            (
+                "dependencies",
+                {
+                    "steam_appid": game["steam_appid"],
+                    "dependencies": game.get("proton_dependencies", []),
+                },
+            ),
+            ("import_saves", {"game_name": game["name"]}),
+            (
+                "steam",
+                {
+                    "steam_appid": game["steam_appid"],
+                    "name": game["name"],
+                    "exe_path": os.path.join(local_target, executable),
+                    "proton_version": game.get("proton_version")
+                    or self.settings["proton"]["defaultVersion"],
+                    "categories": game.get("categories", []),
+                    "launch_options": game.get("launch_options", ""),
+                    "shader_cache": (
+                        os.path.join(game["prefix_path"], PREFIX_SHADER_CACHE)
+                        if game.get("shader_cache_path")
+                        else ""
+                    ),
+                },
+            ),
+        ]
+
+    def _remove_steps(self, game: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        return [
+            ("backup_saves", {"game_name": game["name"]}),
+            ("steam", {"steam_appid": game["steam_appid"]}),
+            ("game_folder", {"path": game["path"]}),
+            ("prefix", {"path": game["prefix_path"]}),
+        ]
+
+    async def _run_job(self, job: Dict[str, Any]) -> List[str]:
+        """Run every step of ``job`` that has not completed yet, in order."""
+        messages: List[str] = []
+        for step in job["steps"]:
+            message = await self._run_step(job, step["name"])
+            if message:
+                messages.append(message)
+        self._journal.finish(job, "done")
+        return messages
+
+    async def _run_step(self, job: Dict[str, Any], name: str) -> Optional[str]:
+        """Run one journaled step unless it already completed."""
+        step = self._journal.step(job, name)
+        if step["status"] == "done":
+            return None
+        self._journal.start_step(job, name)
+        try:
+            message = await self._step_handlers(job["kind"])[name](step["inputs"])
+        except Exception as e:
+            self._journal.fail_step(job, name, str(e))
+            self._journal.finish(job, "failed")
+            raise
+        self._journal.finish_step(job, name, message)
+        return message
+
+    async def _run_batch_step(
+        self,
+        jobs: List[Dict[str, Any]],
+        name: str,
+        steps: List[str],
+        failures: List[str],
+        batch: Optional[
+            Callable[[List[Dict[str, Any]]], Awaitable[Optional[str]]]
+        ] = None,
+        parallel: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Run step ``name`` for several jobs and return the jobs still going.
+
+        ``batch`` handles the inputs of every pending job in one call (one
+        rsync session, one VDF write). Without it the regular per-job handler
+        runs, concurrently when ``parallel`` is set.
+        """
+        if batch is not None:
+            pending = [
+                job for job in jobs if self._journal.step(job, name)["status"] != "done"
+            ]
+            for job in pending:
+                self._journal.start_step(job, name)
+            try:
+                message = (
+                    await batch(
+                        [self._journal.step(job, name)["inputs"] for job in pending]
+                    )
+                    if pending
+                    else None
+                )
+            except Exception as e:
+                for job in pending:
+                    self._journal.fail_step(job, name, str(e))
+                    self._journal.finish(job, "failed")
+                    failures.append(f"{job['game']}: {e}")
+                return [job for job in jobs if job not in pending]
+            for job in pending:
+                self._journal.finish_step(job, name, message)
+            if message and pending:
+                steps.append(f"{message} ({len(pending)} games)")
+            return jobs
+
+        if parallel:
+            results = await asyncio.gather(
+                *(self._run_step(job, name) for job in jobs), return_exceptions=True
+            )
+        else:
+            results = []
+            for job in jobs:
+                try:
+                    results.append(await self._run_step(job, name))
+                except Exception as e:  # pylint: disable=broad-except
+                    results.append(e)
+
+        remaining = []
+        for job, result in zip(jobs, results):
+            if isinstance(result, BaseException):
+                failures.append(f"{job['game']}: {result}")
+                continue
+            if result:
+                steps.append(f"{job['game']}: {result}")
+            remaining.append(job)
+        return remaining
+
+    def _step_handlers(
+        self, kind: str
+    ) -> Dict[str, Callable[[Dict[str, Any]], Awaitable[Optional[str]]]]:
+        return {
+            "install": {
+                "download": self._step_download,
+                "prefix": self._step_prefix,
+                "shader_cache": self._step_shader_cache,
+                "manifest": self._step_manifest,
+                "dependencies": self._step_dependencies,
+                "import_saves": self._step_import_saves,
+                "steam": self._step_add_to_steam,
+            },
+            "remove": {
+                "backup_saves": self._step_backup_saves,
+                "steam": self._step_remove_from_steam,
+                "game_folder": self._step_delete_game_folder,
+                "prefix": self._step_delete_prefix,
+            },
+        }[kind]
+
+    async def _rollback_job(self, job: Dict[str, Any]) -> None:
+        """Undo the started steps of an interrupted install, newest first."""
+        for step in reversed(job["steps"]):
+            if step["status"] == "pending":
+                continue
+            inputs = step["inputs"]
+            if step["name"] == "steam":
+                await self._remove_from_steam(inputs["steam_appid"])
+            elif step["name"] == "prefix" and os.path.exists(inputs["prefix_path"]):
+                shutil.rmtree(inputs["prefix_path"])
+            elif step["name"] == "download" and os.path.exists(inputs["local_target"]):
+                shutil.rmtree(inputs["local_target"])
+        self._journal.finish(job, "rolled_back")
+
+    async def _recover_jobs(self) -> None:
+        """Resume or roll back jobs that were interrupted by a restart."""
+        mode = self.settings.get("jobRecovery", "resume")
+        if mode not in JOB_RECOVERY_MODES:
+            mode = "resume"
+        for job in self._journal.unfinished():
+            # A half-removed game cannot be restored, so removals always resume
+            action = "resume" if job["kind"] == "remove" else mode
+            decky.logger.info(
+                f"[Deckyfin] Recovering interrupted {job['kind']} of "
+                f"'{job['game']}' ({action})"
+            )
+            try:
+                if action == "rollback":
+                    await self._rollback_job(job)
+                    continue
+                if not self._cached_games:
+                    await self.load_games()
+                await self._run_job(job)
+            except Exception as err:  # pylint: disable=broad-except
+                decky.logger.error(
+                    f"[Deckyfin] Recovery of {job['kind']} for '{job['game']}' failed: {err}"
+                )
+        try:
+            await self.load_games()
+        except Exception as err:  # pylint: disable=broad-except
+            decky.logger.warning(f"[Deckyfin] Could not refresh games: {err}")
+
+    async def _step_download(self, inputs: Dict[str, Any]) -> str:
+        try:
+            prefetched = await self._claim_prefetched(inputs["local_target"])
+            pulled = None
+            if not prefetched:
+                pulled = await self._pull_from_peer(
+                    os.path.basename(inputs["local_target"]),
+                    inputs["local_target"],
+                    inputs["remote_target"],
+                )
+            os.makedirs(inputs["local_target"], exist_ok=True)
+            # With a staged or peer copy this is only a quick up-to-date check
+            await self._rsync_directory(
+                inputs["remote_target"],
+                inputs["local_target"],
+                download=True,
+                delete=False,
+            )
+            if pulled and pulled[1]:
+                # The host published no hashes, so compare peer files in full
+                await self._rsync_file_list(
+                    inputs["remote_target"],
+                    inputs["local_target"],
+                    pulled[1],
+                    download=True,
+                    extra_flags=["--checksum"],
+                )
+        except Exception as e:
+            raise RuntimeError(f"Failed to download game: {e}") from e
+        if prefetched:
+            return "Moved prefetched game files"
+        if pulled:
+            return f"Downloaded game files from peer {pulled[0]}"
+        return "Downloaded game files"
+
+    async def _step_prefix(self, inputs: Dict[str, Any]) -> str:
+        try:
+            await self.setup_proton_prefix(inputs["steam_appid"])
+        except Exception as e:
+            raise RuntimeError(f"Failed to setup prefix: {e}") from e
+        return "Created Proton prefix"
+
+    async def _step_manifest(self, inputs: Dict[str, Any]) -> str:
+        try:
+            manifest = await self._build_manifest(
+                inputs["remote_target"], inputs["local_target"], inputs.get("version")
+            )
+            self._write_manifest(inputs["manifest_path"], manifest)
+            self._write_prefix_metadata(
+                os.path.dirname(inputs["manifest_path"]),
+                {"game_version": manifest["version"]},
+            )
+        except Exception as e:
+            decky.logger.warning(f"Failed to record file manifest: {e}")
+            # The files still came from this version, so it is not outdated
+            try:
+                self._write_prefix_metadata(
+                    os.path.dirname(inputs["manifest_path"]),
+                    {"game_version": str(inputs.get("version") or "")},
+                )
+            except OSError as err:
+                decky.logger.warning(f"Failed to record game version: {err}")
+            return f"File manifest had issues: {e}"
+        return f"Recorded manifest of {len(manifest['files'])} files"
+
+    async def _step_dependencies(self, inputs: Dict[str, Any]) -> Optional[str]:
+        deps = inputs["dependencies"]
+        if not deps:
+            return None
+        try:
+            await self._install_proton_dependencies(inputs["steam_appid"], deps)
+        except Exception as e:
+            decky.logger.warning(f"Failed to install some dependencies: {e}")
+            return f"Dependency installation had issues: {e}"
+        return f"Installed dependencies: {', '.join(deps)}"
+
+    async def _step_shader_cache(self, inputs: Dict[str, Any]) -> Optional[str]:
+        game = await self._require_game_by_name(inputs["game_name"])
+        if not game.get("shader_cache_path"):
+            return None
+        try:
+            merged = await self._pull_shader_cache(game, inputs["local_target"])
+        except Exception as e:
+            # A cold cache only costs stutter, never fail the install over it
+            decky.logger.warning(f"Failed to download shader cache: {e}")
+            return f"Shader cache download had issues: {e}"
+        return f"Merged {len(merged)} shader cache files"
+
+    async def _step_import_saves(self, inputs: Dict[str, Any]) -> Optional[str]:
+        if not self._config_saves_path:
+            return None
+        try:
+            await self._import_saves_from_remote(inputs["game_name"])
+        except Exception as e:
+            decky.logger.warning(f"Failed to import saves: {e}")
+            return f"Save import had issues: {e}"
+        return "Imported saves from remote"
+
+    async def _step_add_to_steam(self, inputs: Dict[str, Any]) -> str:
+        try:
+            await self._add_to_steam(
+                inputs["steam_appid"],
+                inputs["name"],
+                inputs["exe_path"],
+                inputs["proton_version"],
+                inputs["categories"],
+                inputs["launch_options"],
+                inputs.get("shader_cache", ""),
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to add to Steam: {e}") from e
+        return "Added to Steam library"
+
+    async def _step_backup_saves(self, inputs: Dict[str, Any]) -> str:
+        try:
+            await self.sync_game_saves(inputs["game_name"])
+        except Exception as e:
+            decky.logger.warning(f"Save backup had issues: {e}")
+            return f"Save backup warning: {e}"
+        return "Backed up saves"
+
+    async def _step_remove_from_steam(self, inputs: Dict[str, Any]) -> str:
+        try:
+            await self._remove_from_steam(inputs["steam_appid"])
+        except Exception as e:
+            decky.logger.warning(f"Steam removal had issues: {e}")
+            return f"Steam removal warning: {e}"
+        return "Removed from Steam library"
+
+    async def _step_delete_game_folder(self, inputs: Dict[str, Any]) -> Optional[str]:
+        try:
+            if not os.path.exists(inputs["path"]):
+                return None
+            shutil.rmtree(inputs["path"])
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete game folder: {e}") from e
+        return "Deleted game folder"
+
+    async def _step_delete_prefix(self, inputs: Dict[str, Any]) -> Optional[str]:
+        try:
+            if not os.path.exists(inputs["path"]):
+                return None
+            shutil.rmtree(inputs["path"])
+        except Exception as e:
+            decky.logger.warning(f"Prefix deletion had issues: {e}")
+            return f"Prefix deletion warning: {e}"
+        return "Deleted Proton prefix"
+
+    # endregion -----------------------------------------------------------
+
+    # region storage ------------------------------------------------------
+    async def get_storage_report(self) -> Dict[str, Any]:
+        """Disk usage of games, prefixes and backups plus reclaimable leftovers."""
+        await self._refresh_disk_usage(rescan=True)
+        if not self._cached_games:
+            try:
+                await self.load_games()
+            except Exception as err:  # pylint: disable=broad-except
+                decky.logger.warning(
+                    f"[Deckyfin] Storage report without catalog: {err}"
+                )
+        usage = self._disk_usage
+        games = [
+            {
+                "name": game["name"],
+                "installed": game.get("installed", False),
+                "game_bytes": usage.total(game["path"]),
+                "prefix_bytes": usage.total(game["prefix_path"]),
+                "backup_bytes": usage.total(game["backup_path"]),
+            }
+            for game in self._cached_games
+        ]
+        candidates = self._gc_candidates()
+        return {
+            "roots": [
+                {"label": label, "path": path, "bytes": usage.total(path)}
+                for label, path in self._storage_roots()
+            ],
+            "games": games,
+            "reclaimable": candidates,
+            "reclaimable_bytes": sum(item["bytes"] for item in candidates),
+            "refreshedAt": _now_iso(),
+        }
+
+    async def collect_garbage(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Delete orphaned prefixes, expired backups and leftovers."""
+        await self._refresh_disk_usage(rescan=True)
+        # Never classify prefixes as orphaned against a stale or missing catalog
+        await self.load_games()
+        candidates = self._gc_candidates()
+        removed: List[str] = []
+        failures: List[str] = []
+        freed = 0
+        for item in candidates:
+            if dry_run:
+                continue
+            try:
+                if os.path.isdir(item["path"]) and not os.path.islink(item["path"]):
+                    shutil.rmtree(item["path"])
+                else:
+                    os.remove(item["path"])
+            except OSError as err:
+                failures.append(f"{item['path']}: {err}")
+                continue
+            removed.append(item["path"])
+            freed += item["bytes"]
+        if removed:
+            await self._refresh_disk_usage()
+        return {
+            "ok": len(failures) == 0,
+            "message": (
+                f"{len(candidates)} items ({sum(item['bytes'] for item in candidates)} bytes) can be removed"
+                if dry_run
+                else f"Removed {len(removed)} items, freed {freed} bytes"
+            ),
+            "removed": removed,
+            "reclaimable": candidates if dry_run else [],
+            "failures": failures,
+            "timestamp": _now_iso(),
+        }
+
+    def _storage_roots(self) -> List[Tuple[str, str]]:
+        return [
+            ("Games", self.settings["localGamesPath"]),
+            ("Proton prefixes", self.settings["proton"]["compatdataPath"]),
+            ("Save backups", self.settings["saveBackupPath"]),
+            ("Prefetched games", PREFETCH_DIR),
+            ("Plugin data", DATA_DIR),
+        ]
+
+    def _steam_userdata_path(self) -> str:
+        return self._steam_accounts.userdata_path
+
+    async def _refresh_disk_usage(self, rescan: bool = False) -> None:
+        """Pick up added and removed entries; ``rescan`` also re-reads old ones.
+
+        Only reports and garbage collection ask for a rescan, so files that
+        grew in place are stat-ed again at most every ``DISK_RESCAN_SECONDS``
+        and only when someone looks at the numbers.
+        """
+        roots = [path for _label, path in self._storage_roots()]
+        max_age = DISK_RESCAN_SECONDS if rescan else None
+        async with self._disk_lock:
+            await asyncio.to_thread(self._disk_usage.refresh, roots, max_age)
+
+    async def _index_disk_usage(self) -> None:
+        """Keep the disk usage index warm in the background."""
+        while True:
+            try:
+                # Walking every game folder is exactly the I/O a game should not see
+                if not self._governor.gaming:
+                    await self._refresh_disk_usage()
+            except Exception as err:  # pylint: disable=broad-except
+                decky.logger.warning(f"[Deckyfin] Disk usage indexing failed: {err}")
+            interval = (self.settings.get("storage") or {}).get("indexInterval", 1800)
+            await asyncio.sleep(max(int(interval), 60))
+
+    def _gc_candidates(self) -> List[Dict[str, Any]]:
+        """Everything the retention policy allows collect_garbage to delete."""
+        policy = self.settings.get("storage") or {}
+        now = time.time()
+        prefix_age = float(policy.get("prefixRetentionDays", 30)) * 86400
+        backup_age = float(policy.get("backupRetentionDays", 30)) * 86400
+        keep_shortcut_backups = int(policy.get("shortcutBackupsToKeep", 1))
+        # A backup never uploaded may be the only copy of the saves
+        local_only_backups = bool(policy.get("collectLocalOnlyBackups", False))
+        usage = self._disk_usage
+        candidates: List[Dict[str, Any]] = []
+
+        def add(kind: str, path: str, reason: str) -> None:
+            candidates.append(
+                {
+                    "kind": kind,
+                    "path": path,
+                    "bytes": usage.total(path),
+                    "reason": reason,
+                }
+            )
+
+        def age(path: str) -> float:
+            try:
+                return now - os.stat(path).st_mtime
+            except OSError:
+                return float("inf")
+
+        if not self._cached_games:
+            # Without a catalog every prefix would look orphaned
+            return candidates
+        catalog_appids = {str(game["steam_appid"]) for game in self._cached_games}
+        # A typo in an entry must not make its prefix look orphaned
+        catalog_appids.update(
+            str(entry["steam_appid"])
+            for entry in self._rejected_games
+            if entry.get("steam_appid") is not None
+        )
+        busy_appids = {
+            str(step["inputs"].get("steam_appid"))
+            for job in self._journal.unfinished()
+            for step in job["steps"]
+            if "steam_appid" in step["inputs"]
+        }
+        compatdata_root = self.settings["proton"]["compatdataPath"]
+        if os.path.isdir(compatdata_root):
+            with os.scandir(compatdata_root) as entries:
+                for entry in entries:
+                    if (
+                        entry.is_dir(follow_symlinks=False)
+                        and entry.name not in catalog_appids
+                        and entry.name not in busy_appids
+                        # Wine rewrites the registry files whenever the prefix runs
+                        and min(
+                            age(entry.path),
+                            age(os.path.join(entry.path, "pfx", "user.reg")),
+                            age(os.path.join(entry.path, "pfx", "system.reg")),
+                        )
+                        > prefix_age
+                    ):
+                        add("prefix", entry.path, "appid is not in the catalog")
+
+        installed_slugs = {
+            _slugify(game["name"])
+            for game in self._cached_games
+            if game.get("installed")
+        }
+        catalog_slugs = {_slugify(game["name"]) for game in self._cached_games}
+        rejected_slugs = {
+            entry["slug"] for entry in self._rejected_games if entry.get("slug")
+        }
+        backup_root = self.settings["saveBackupPath"]
+        if os.path.isdir(backup_root):
+            with os.scandir(backup_root) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name in installed_slugs or entry.name in rejected_slugs:
+                        continue
+                    if not local_only_backups and not self._backup_uploaded(entry.path):
+                        continue
+                    marker = os.path.join(entry.path, ".last_sync")
+                    if (
+                        age(marker if os.path.exists(marker) else entry.path)
+                        > backup_age
+                    ):
+                        add(
+                            "backup",
+                            entry.path,
+                            (
+                                "game is not installed"
+                                if entry.name in catalog_slugs
+                                else "game is not in the catalog"
+                            ),
+                        )
+
+        userdata = self._steam_userdata_path()
+        if os.path.isdir(userdata):
+            for user_id in os.listdir(userdata):
+                config_dir = os.path.join(userdata, user_id, "config")
+                if not user_id.isdigit() or not os.path.isdir(config_dir):
+                    continue
+                backups = sorted(
+                    (
+                        os.path.join(config_dir, name)
+                        for name in os.listdir(config_dir)
+                        if name.startswith("shortcuts.vdf") and "backup" in name
+                    ),
+                    key=os.path.getmtime,
+                    reverse=True,
                 )
+                for path in backups[keep_shortcut_backups:]:
+                    add("shortcut_backup", path, "older shortcuts.vdf backup")
+
+        for path in self._stale_prefetches():
+            add("prefetch", path, "game is installed or no longer in the catalog")
 
-            # Extract remote games base directory from config path
-            remote_config_path = self.settings.get("remoteConfigPath", "")
-            remote_games_base = os.path.dirname(remote_config_path)
-            remote_target = os.path.join(remote_games_base, remote_path)
+        staging = os.path.join(self.settings["localGamesPath"], BATCH_STAGING_NAME)
+        if os.path.isdir(staging) and not self._journal.unfinished():
+            add("leftover", staging, "interrupted batch download")
+        for name in os.listdir(DATA_DIR):
+            path = os.path.join(DATA_DIR, name)
+            if name.endswith((".tmp", ".files")) and age(path) > 86400:
+                add("leftover", path, "stale temporary file")
+        return candidates
 
-            # Local path is always in the configured local games folder, using game name
-            local_target = os.path.join(
-                self.settings["localGamesPath"], _slugify(game_name)
+    # endregion -----------------------------------------------------------
+
+    # region peers --------------------------------------------------------
+    async def _configure_peer_server(self) -> None:
+        """Start, restart or stop serving games to peers to match settings."""
+        options = self.settings.get("peers") or {}
+        if self._peer_server:
+            await self._peer_server.stop()
+            self._peer_server = None
+        if not options.get("serve"):
+            return
+        server = PeerServer(
+            self._served_games,
+            lambda: self._governor.gaming,
+            int(options.get("port", 8730)),
+            int(options.get("discoveryPort", 8731)),
+        )
+        try:
+            await server.start()
+        except OSError as err:
+            decky.logger.error(f"[Deckyfin] Could not serve games to peers: {err}")
+            return
+        self._peer_server = server
+
+    def _served_games(self) -> Dict[str, Tuple[str, Dict[str, Dict[str, Any]]]]:
+        """Installed games with a manifest and no job or update in progress.
+
+        Maps slugs to the game folder and the files that still matched the
+        manifest's sizes, with their mtimes, so a peer never copies a game
+        that is half downloaded or being updated. The table is built once per
+        catalog or manifest change; only the busy games are checked per call.
+        """
+        if self._served is None:
+            self._served = self._build_served_table()
+        busy = {job["game"] for job in self._journal.unfinished()}
+        busy.update(self._busy_games)
+        return {
+            slug: (root, files)
+            for slug, (name, root, files) in self._served.items()
+            if name not in busy
+        }
+
+    def _build_served_table(
+        self,
+    ) -> Dict[str, Tuple[str, str, Dict[str, Dict[str, Any]]]]:
+        served: Dict[str, Tuple[str, str, Dict[str, Dict[str, Any]]]] = {}
+        for game in self._cached_games:
+            if not game.get("installed"):
+                continue
+            try:
+                manifest = self._read_manifest(game)
+            except (RuntimeError, OSError, ValueError):
+                continue
+            files: Dict[str, Dict[str, Any]] = {}
+            for relative, entry in manifest["files"].items():
+                try:
+                    stat = os.stat(os.path.join(game["path"], *relative.split("/")))
+                except OSError:
+                    continue
+                if stat.st_size == entry["size"]:
+                    files[relative] = {**entry, "mtime": stat.st_mtime}
+            served[game["slug"]] = (game["name"], game["path"], files)
+        return served
+
+    async def _find_peers(self, slug: str) -> List[Tuple[str, int]]:
+        """Peers offering ``slug``: configured hosts first, then discovered ones."""
+        options = self.settings.get("peers") or {}
+        default_port = int(options.get("port", 8730))
+        found: List[Tuple[str, int]] = []
+        for entry in options.get("hosts") or []:
+            host, _, port = entry.strip().partition(":")
+            address = (host, int(port) if port else default_port)
+            try:
+                if slug in await fetch_peer_json(*address, "/games"):
+                    found.append(address)
+            except PEER_ERRORS as err:
+                decky.logger.info(f"[Deckyfin] Peer {entry} unavailable: {err}")
+
+        if options.get("discover", True):
+            own = self._peer_server.instance if self._peer_server else None
+            try:
+                replies = await discover_peers(int(options.get("discoveryPort", 8731)))
+            except OSError as err:
+                decky.logger.info(f"[Deckyfin] Peer discovery failed: {err}")
+                replies = []
+            seen = {own}
+            for address, reply in replies:
+                # A device on several networks answers once per interface
+                if reply.get("id") in seen or slug not in (reply.get("games") or []):
+                    continue
+                seen.add(reply.get("id"))
+                peer = (address, int(reply.get("port", default_port)))
+                if peer not in found:
+                    found.append(peer)
+        return found
+
+    async def _pull_from_peer(
+        self, slug: str, destination: str, remote_target: str
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Copy ``slug`` from the first peer that has it, ``None`` if none did.
+
+        Files are checked against the manifest the remote host publishes in
+        ``remote_target``. Without one, the copied files are returned as
+        unverified so the caller can have rsync compare their checksums with
+        the host's.
+        """
+        options = self.settings.get("peers") or {}
+        if not options.get("hosts") and not options.get("discover", True):
+            return None
+        peers = await self._find_peers(slug)
+        if not peers:
+            return None
+        published = await self._published_manifest(remote_target)
+        expected = (
+            {
+                relative: entry["sha256"]
+                for relative, entry in published["files"].items()
+                if isinstance(entry, dict) and isinstance(entry.get("sha256"), str)
+            }
+            if published
+            else None
+        )
+        for host, port in peers:
+            peer = f"{host}:{port}"
+            try:
+                received, copied = await download_from_peer(
+                    host, port, slug, destination, expected
+                )
+            except PEER_ERRORS as err:
+                decky.logger.warning(f"[Deckyfin] Peer {peer} failed for {slug}: {err}")
+                continue
+            decky.logger.info(
+                f"[Deckyfin] Copied {received} bytes of {slug} from {peer}"
             )
+            return peer, copied if expected is None else []
+        return None
+
+    # endregion -----------------------------------------------------------
+
+    # region shader caches ----------------------------------------------
+    def _remote_shader_cache(self, game: Dict[str, Any]) -> str:
+        # Relative to the remote games directory, like the game's own path
+        remote_games_base = os.path.dirname(self.settings.get("remoteConfigPath", ""))
+        return os.path.join(remote_games_base, game["shader_cache_path"])
 
-            os.makedirs(local_target, exist_ok=True)
+    async def _pull_shader_cache(
+        self, game: Dict[str, Any], local_cache: str
+    ) -> List[str]:
+        """Fetch the shared cache and merge it into the prefix's cache.
+
+        The remote copy is mirrored under ``SHADER_CACHE_DIR`` so repeated
+        syncs only transfer what other devices added since.
+        """
+        mirror = os.path.join(SHADER_CACHE_DIR, _slugify(game["name"]))
+        await self._rsync_directory(
+            self._remote_shader_cache(game), mirror, download=True, delete=False
+        )
+        os.makedirs(local_cache, exist_ok=True)
+        return await asyncio.to_thread(merge_cache_tree, mirror, local_cache)
+
+    async def _push_shader_cache(self, game: Dict[str, Any]) -> int:
+        """Merge local and shared caches both ways and upload the result."""
+        local_cache = os.path.join(game["prefix_path"], PREFIX_SHADER_CACHE)
+        await self._pull_shader_cache(game, local_cache)
+        mirror = os.path.join(SHADER_CACHE_DIR, _slugify(game["name"]))
+        grown = await asyncio.to_thread(merge_cache_tree, local_cache, mirror)
+        if grown:
+            # No --delete: files other devices added since the pull survive
             await self._rsync_directory(
-                remote_target, local_target, download=True, delete=False
+                self._remote_shader_cache(game), mirror, upload=True, delete=False
             )
-            steps.append("Downloaded game files")
-        except Exception as e:
-            raise RuntimeError(f"Failed to download game: {e}") from e
+        return len(grown)
 
-        # Step 2: Setup Proton prefix
-        try:
-            await self.setup_proton_prefix(game["steam_appid"])
-            steps.append("Created Proton prefix")
-        except Exception as e:
-            raise RuntimeError(f"Failed to setup prefix: {e}") from e
+    # endregion -----------------------------------------------------------
 
-        # Step 3: Install Proton dependencies
-        try:
-            deps = game.get("proton_dependencies", [])
-            if deps:
-                await self._install_proton_dependencies(game["steam_appid"], deps)
-                steps.append(f"Installed dependencies: {', '.join(deps)}")
-        except Exception as e:
-            decky.logger.warning(f"Failed to install some dependencies: {e}")
-            steps.append(f"Dependency installation had issues: {e}")
+    # region prefetch -----------------------------------------------------
+    async def _prefetch_loop(self) -> None:
+        """Stage likely installs in the background during the idle window."""
+        while True:
+            await asyncio.sleep(PREFETCH_CHECK_SECONDS)
+            options = self.settings.get("prefetch") or {}
+            if not options.get("enabled") or self._governor.gaming:
+                continue
+            if not self._in_prefetch_window(options):
+                continue
+            try:
+                await self._prefetch_once(options)
+            except Exception as err:  # pylint: disable=broad-except
+                decky.logger.warning(f"[Deckyfin] Prefetch pass failed: {err}")
 
-        # Step 4: Import saves from remote
-        try:
-            if self._config_saves_path:
-                await self._import_saves_from_remote(game_name)
-                steps.append("Imported saves from remote")
-        except Exception as e:
-            decky.logger.warning(f"Failed to import saves: {e}")
-            steps.append(f"Save import had issues: {e}")
+    async def _prefetch_once(self, options: Dict[str, Any]) -> None:
+        await self.load_games()
+        for path in self._stale_prefetches():
+            shutil.rmtree(path, ignore_errors=True)
+
+        budget = int(float(options.get("budgetGB", 20)) * 1024**3)
+        os.makedirs(PREFETCH_DIR, exist_ok=True)
+        await self._refresh_disk_usage()
+        used = self._disk_usage.total(PREFETCH_DIR)
+        remote_games_base = os.path.dirname(self.settings.get("remoteConfigPath", ""))
+
+        for game in self._prefetch_candidates(options):
+            if not self._in_prefetch_window(options) or self._governor.gaming:
+                return
+            slug = _slugify(game["name"])
+            if self._prefetched_path(slug):
+                continue
+            staged = os.path.join(PREFETCH_DIR, slug)
+            remote_target = os.path.join(remote_games_base, game["remote_path"])
+            size = await self._remote_size(remote_target)
+            already = self._disk_usage.total(staged)
+            if size is None or used - already + size > budget:
+                continue
+            if shutil.disk_usage(DATA_DIR).free < size - already + 1024**3:
+                continue
+            decky.logger.info(f"[Deckyfin] Prefetching {game['name']}")
+            try:
+                # Stop at the window end; --partial lets the next window resume
+                await asyncio.wait_for(
+                    self._rsync_directory(remote_target, staged, download=True),
+                    self._prefetch_window_left(options),
+                )
+            except asyncio.TimeoutError:
+                decky.logger.info(
+                    f"[Deckyfin] Prefetch window closed during {game['name']}"
+                )
+                return
+            with open(
+                os.path.join(staged, PREFETCH_MARKER), "w", encoding="utf-8"
+            ) as handle:
+                json.dump(
+                    {"name": game["name"], "bytes": size, "completed": _now_iso()},
+                    handle,
+                )
+            used += size - already
 
-        # Step 5: Add to Steam
-        try:
-            executable = game.get("executable", "")
-            exe_path = os.path.join(local_target, executable)
-            categories = game.get("categories", [])
-            launch_options = game.get("launch_options", "")
-            await self._add_to_steam(
-                game["steam_appid"],
-                game["name"],
-                exe_path,
-                game.get("proton_version") or self.settings["proton"]["defaultVersion"],
-                categories,
-                launch_options,
-            )
-            steps.append("Added to Steam library")
-        except Exception as e:
-            raise RuntimeError(f"Failed to add to Steam: {e}") from e
+    def _prefetch_candidates(self, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Catalog-flagged games first, then games predicted from recent installs.
 
-        # Refresh cache
-        await self.load_games()
+        Predictions score uninstalled games by how many categories they share
+        with recently installed games, weighting more recent installs higher.
+        """
+        available = [
+            game
+            for game in self._cached_games
+            if not game.get("installed") and game.get("remote_path")
+        ]
+        flagged = [game for game in available if game.get("prefetch")]
+
+        by_name = {game["name"]: game for game in self._cached_games}
+        weights: Dict[str, float] = {}
+        for rank, job in enumerate(self._journal.history("install")):
+            for category in by_name.get(job["game"], {}).get("categories") or []:
+                weights[category] = weights.get(category, 0.0) + 1.0 / (rank + 1)
+        scored = sorted(
+            (
+                (sum(weights.get(c, 0.0) for c in game.get("categories") or []), game)
+                for game in available
+                if not game.get("prefetch")
+            ),
+            key=lambda pair: pair[0],
+            reverse=True,
+        )
+        predicted = [game for score, game in scored if score > 0]
+        return flagged + predicted[: int(options.get("predictedGames", 2))]
+
+    def _in_prefetch_window(self, options: Dict[str, Any]) -> bool:
+        start = options.get("windowStart", "01:00")
+        end = options.get("windowEnd", "07:00")
+        now = datetime.now().strftime("%H:%M")
+        if start == end:
+            return True
+        if start < end:
+            return start <= now < end
+        # Window wraps around midnight
+        return now >= start or now < end
+
+    def _prefetch_window_left(self, options: Dict[str, Any]) -> Optional[float]:
+        """Seconds until the prefetch window closes, None if it never does."""
+        start = options.get("windowStart", "01:00")
+        end = options.get("windowEnd", "07:00")
+        if start == end:
+            return None
+        now = datetime.now()
+        hour, minute = (int(part) for part in end.split(":"))
+        closes = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if closes <= now:
+            closes += timedelta(days=1)
+        return (closes - now).total_seconds()
+
+    def _prefetched_path(self, slug: str) -> Optional[str]:
+        staged = os.path.join(PREFETCH_DIR, slug)
+        if os.path.exists(os.path.join(staged, PREFETCH_MARKER)):
+            return staged
+        return None
 
-        return {
-            "ok": True,
-            "message": f"Game '{game_name}' installed successfully",
-            "steps": steps,
-            "timestamp": _now_iso(),
+    def _stale_prefetches(self) -> List[str]:
+        if not self._cached_games or not os.path.isdir(PREFETCH_DIR):
+            return []
+        wanted = {
+            _slugify(game["name"])
+            for game in self._cached_games
+            if not game.get("installed")
         }
+        wanted.update(
+            entry["slug"] for entry in self._rejected_games if entry.get("slug")
+        )
+        return [
+            os.path.join(PREFETCH_DIR, name)
+            for name in os.listdir(PREFETCH_DIR)
+            if name not in wanted
+        ]
+
+    async def _claim_prefetched(
+        self, local_target: str, destination: Optional[str] = None
+    ) -> bool:
+        """Move a completed prefetch of ``local_target`` into place."""
+        staged = self._prefetched_path(os.path.basename(local_target))
+        destination = destination or local_target
+        if staged is None or os.path.exists(destination):
+            return False
+        os.remove(os.path.join(staged, PREFETCH_MARKER))
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # A rename when staging and games share a filesystem, a copy otherwise
+        await asyncio.to_thread(shutil.move, staged, destination)
+        return True
+
+    async def _remote_size(self, remote_target: str) -> Optional[int]:
+        hosts = self._download_hosts()
+        if not hosts:
+            return None
+        result = await self._governor.execute(
+            "ssh",
+            hosts[0],
+            f"du -sb {shlex.quote(remote_target)}",
+            timeout=self._timeout("ssh"),
+        )
+        if not result.ok:
+            return None
+        try:
+            return int(result.stdout.split()[0])
+        except (IndexError, ValueError):
+            return None
 
-    async def remove_game(self, game_name: str) -> Dict[str, Any]:
-        """Remove game: backup saves, delete files, remove from Steam."""
-        game = await self._require_game_by_name(game_name)
+    # endregion -----------------------------------------------------------
 
-        if not game.get("installed"):
-            raise RuntimeError(f"Game '{game_name}' is not installed")
+    # region background save watcher -------------------------------------
+    def _watch_steam_accounts(self) -> None:
+        """Forget the cached Steam account whenever loginusers.vdf changes."""
+
+        async def changed(_name: str, _paths: Set[str]) -> None:
+            decky.logger.info("[Deckyfin] loginusers.vdf changed")
+            self._steam_accounts.invalidate()
+
+        target = self._steam_accounts.loginusers_path
+        if not os.path.isfile(target):
+            # Before the first login only the folder exists
+            target = os.path.dirname(target)
+        self._steam_watcher = SaveWatcher(changed, quiet_period=1, poll_interval=30)
+        self._steam_watcher.update_targets({"steam": [target]})
+        self._steam_watcher.start()
+
+    async def _configure_save_watcher(self) -> None:
+        """Start, restart or stop the background watcher to match settings."""
+        options = self.settings.get("saveWatcher") or {}
+        if self._save_watcher:
+            await self._save_watcher.stop()
+            self._save_watcher = None
+        if not options.get("enabled"):
+            return
 
-        steps = []
+        if not self._cached_games:
+            try:
+                await self.load_games()
+            except Exception as err:  # pylint: disable=broad-except
+                decky.logger.warning(
+                    f"[Deckyfin] Could not refresh games for save watcher: {err}"
+                )
+                if os.path.exists(CACHE_GAMES_PATH):
+                    cached = load_games_json(CACHE_GAMES_PATH)
+                    self._cached_games = [
+                        self._decorate_game(entry) for entry in cached["games"]
+                    ]
+                    self._rejected_games = cached["rejected"]
+                    self._served = None
+                    self._config_saves_path = cached.get("savesPath", "")
+
+        watcher = SaveWatcher(
+            self._backup_changed_saves,
+            quiet_period=options.get("quietPeriod", 30),
+            poll_interval=options.get("pollInterval", 60),
+        )
+        targets = self._save_watch_targets()
+        watcher.update_targets(targets)
+        watcher.start()
+        self._save_watcher = watcher
+        decky.logger.info(
+            f"[Deckyfin] Save watcher started ({watcher.backend}) "
+            f"for {len(targets)} games"
+        )
 
-        # Step 1: Backup saves
-        try:
+    def _save_watch_targets(self) -> Dict[str, List[str]]:
+        targets: Dict[str, List[str]] = {}
+        for game in self._cached_games:
+            if not game.get("installed") or not game.get("proton_sync_paths"):
+                continue
+            targets[game["name"]] = [
+                self._resolve_proton_path(game["prefix_path"], relative)
+                for relative in game["proton_sync_paths"]
+            ]
+        return targets
+
+    async def _backup_changed_saves(self, game_name: str, changed: Set[str]) -> None:
+        """Copy only ``changed`` save files into the backup folder and upload them."""
+        game = await self._require_game_by_name(game_name)
+        if game.get("save_mode") == "packed":
+            # A packed archive is one object, so any change means a full repack
             await self.sync_game_saves(game_name)
-            steps.append("Backed up saves")
-        except Exception as e:
-            decky.logger.warning(f"Save backup had issues: {e}")
-            steps.append(f"Save backup warning: {e}")
-
-        # Step 2: Remove from Steam
-        try:
-            await self._remove_from_steam(game["steam_appid"])
-            steps.append("Removed from Steam library")
-        except Exception as e:
-            decky.logger.warning(f"Steam removal had issues: {e}")
-            steps.append(f"Steam removal warning: {e}")
+            return
+        backup_root = os.path.join(
+            self.settings["saveBackupPath"], _slugify(game["name"])
+        )
+        roots = [
+            (
+                self._resolve_proton_path(game["prefix_path"], relative),
+                self._sanitize_relative(relative),
+            )
+            for relative in game.get("proton_sync_paths") or []
+        ]
+
+        files: Set[str] = set()
+        for path in changed:
+            if os.path.isdir(path):
+                # The watcher marks whole roots after dropping events
+                for dirpath, _dirnames, filenames in os.walk(path):
+                    files.update(os.path.join(dirpath, name) for name in filenames)
+            elif os.path.isfile(path):
+                files.add(path)
+
+        copied: List[str] = []
+        for path in sorted(files):
+            for resolved, backup_relative in roots:
+                if path == resolved:
+                    relative = backup_relative
+                elif path.startswith(os.path.join(resolved, "")):
+                    relative = os.path.join(
+                        backup_relative, os.path.relpath(path, resolved)
+                    )
+                else:
+                    continue
+                target = os.path.join(backup_root, relative)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(path, target)
+                copied.append(relative)
+                break
 
-        # Step 3: Delete game folder
-        try:
-            if os.path.exists(game["path"]):
-                shutil.rmtree(game["path"])
-                steps.append("Deleted game folder")
-        except Exception as e:
-            raise RuntimeError(f"Failed to delete game folder: {e}") from e
+        if not copied:
+            return
 
-        # Step 4: Delete Proton prefix
-        try:
-            if os.path.exists(game["prefix_path"]):
-                shutil.rmtree(game["prefix_path"])
-                steps.append("Deleted Proton prefix")
-        except Exception as e:
-            decky.logger.warning(f"Prefix deletion had issues: {e}")
-            steps.append(f"Prefix deletion warning: {e}")
+        marker = os.path.join(backup_root, ".last_sync")
+        with open(marker, "w", encoding="utf-8") as handle:
+            handle.write(_now_iso())
+        copied.append(".last_sync")
 
-        # Refresh cache
-        await self.load_games()
+        remote_host = self.settings.get("remoteHost", "").strip()
+        if remote_host and self._config_saves_path:
+            remote_target = os.path.join(
+                self._config_saves_path, _slugify(game["name"])
+            )
+            await self._rsync_file_list(remote_target, backup_root, copied, upload=True)
+            self._mark_uploaded(backup_root)
 
-        return {
-            "ok": True,
-            "message": f"Game '{game_name}' removed successfully",
-            "steps": steps,
-            "timestamp": _now_iso(),
-        }
+        decky.logger.info(
+            f"[Deckyfin] Backed up {len(copied) - 1} changed save files for {game_name}"
+        )
 
     # endregion -----------------------------------------------------------
 
@@ -467,19 +3691,28 @@ class Plugin:
         remote_path = entry.get("path", "")
         # Local path is always in the configured local games folder, using game name
         game_name = entry.get("name", "game")
-        local_path = os.path.join(self.settings["localGamesPath"], _slugify(game_name))
+        slug = entry.get("slug") or _slugify(game_name)
+        local_path = os.path.join(self.settings["localGamesPath"], slug)
         compatdata_root = self.settings["proton"]["compatdataPath"]
         prefix_path = os.path.join(compatdata_root, str(entry.get("steam_appid")))
-        backup_path = os.path.join(self.settings["saveBackupPath"], _slugify(game_name))
+        backup_path = os.path.join(self.settings["saveBackupPath"], slug)
         remote_available = bool(
             self.settings.get("remoteHost", "").strip()
             and self.settings.get("remoteConfigPath", "").strip()
         )
         metadata_path = os.path.join(prefix_path, "deckyfin.json")
         last_backup = self._read_last_backup(backup_path)
+        installed = os.path.exists(local_path)
+        version = str(entry.get("version") or "")
+        installed_version = (
+            self._read_prefix_metadata(prefix_path).get("game_version")
+            if installed
+            else None
+        )
 
         return {
             "name": game_name,
+            "slug": slug,
             "path": local_path,
             "remote_path": remote_path,
             "steam_appid": entry.get("steam_appid"),
@@ -490,7 +3723,21 @@ class Plugin:
             "executable": entry.get("executable", ""),
             "categories": entry.get("categories", []),
             "launch_options": entry.get("launch_options", ""),
-            "installed": os.path.exists(local_path),
+            "save_mode": (
+                entry.get("save_mode")
+                if entry.get("save_mode") in SAVE_MODES
+                else "loose"
+            ),
+            "shader_cache_path": entry.get("shader_cache_path", ""),
+            "prefetch": bool(entry.get("prefetch")),
+            "prefetched": self._prefetched_path(slug) is not None,
+            "installed": installed,
+            "version": version,
+            "installed_version": installed_version,
+            # Installs from before versions were tracked count as outdated
+            "update_available": bool(
+                installed and version and installed_version != version
+            ),
             "prefix_ready": os.path.exists(os.path.join(prefix_path, "pfx")),
             "prefix_path": prefix_path,
             "backup_path": backup_path,
@@ -499,6 +3746,21 @@ class Plugin:
             "metadata_path": metadata_path if os.path.exists(metadata_path) else None,
         }
 
+    def _mark_uploaded(self, backup_root: str) -> None:
+        with open(
+            os.path.join(backup_root, ".last_upload"), "w", encoding="utf-8"
+        ) as handle:
+            handle.write(_now_iso())
+
+    def _backup_uploaded(self, backup_root: str) -> bool:
+        """Whether the remote host has everything in ``backup_root``."""
+        try:
+            uploaded = os.stat(os.path.join(backup_root, ".last_upload")).st_mtime
+            synced = os.stat(os.path.join(backup_root, ".last_sync")).st_mtime
+        except OSError:
+            return False
+        return bool(self._config_saves_path) and uploaded >= synced
+
     def _read_last_backup(self, backup_path: str) -> Optional[str]:
         marker = os.path.join(backup_path, ".last_sync")
         if os.path.exists(marker):
@@ -523,29 +3785,18 @@ class Plugin:
         raise RuntimeError(f"Game with app id {appid} was not found")
 
     def _resolve_proton_path(self, prefix: str, relative: str) -> str:
-        if os.path.isabs(relative):
-            return os.path.expanduser(relative)
-        cleaned = relative.replace("\\", "/")
-        base_drive = os.path.join(prefix, "pfx", "drive_c")
-        env_map = {
-            "%USERPROFILE%": os.path.join(base_drive, "users", "steamuser"),
-            "%APPDATA%": os.path.join(
-                base_drive, "users", "steamuser", "AppData", "Roaming"
-            ),
-            "%LOCALAPPDATA%": os.path.join(
-                base_drive, "users", "steamuser", "AppData", "Local"
-            ),
-            "%DOCUMENTS%": os.path.join(base_drive, "users", "steamuser", "Documents"),
-        }
-        for token, resolved in env_map.items():
-            cleaned = cleaned.replace(token, resolved)
-        cleaned = cleaned.replace("%DRIVE_C%", base_drive)
-        return os.path.normpath(cleaned)
+        in_prefix, path = compile_sync_path(relative)
+        if not in_prefix:
+            return path
+        return os.path.join(prefix, "pfx", "drive_c", *path.split("/"))
 
     def _sanitize_relative(self, path_value: str) -> str:
         cleaned = path_value.replace("\\", "/").strip().strip("/")
         return cleaned.replace("/", os.sep)
 
+    def _save_archive_root(self, path_value: str) -> str:
+        return self._sanitize_relative(path_value).replace(os.sep, "/")
+
     def _copy_any(self, source: str, destination: str) -> None:
         if os.path.isdir(source):
             if os.path.exists(destination):
@@ -555,13 +3806,193 @@ class Plugin:
             os.makedirs(os.path.dirname(destination), exist_ok=True)
             shutil.copy2(source, destination)
 
+    async def _build_manifest(
+        self, remote_target: str, local_target: str, version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Manifest of the remote game folder.
+
+        Uses the manifest published in the remote folder when there is one,
+        otherwise hashes the game on the remote host, or the local copy if
+        that fails too. A catalog ``version`` overrides the published one.
+        """
+        published = await self._published_manifest(remote_target)
+        if published is not None:
+            files = published["files"]
+            source = "published"
+        else:
+            try:
+                files = await self._remote_hash_tree(remote_target)
+                source = "remote"
+            except Exception as err:  # pylint: disable=broad-except
+                decky.logger.info(
+                    f"[Deckyfin] Hashing locally, remote manifest unavailable: {err}"
+                )
+                files = await asyncio.to_thread(hash_tree, local_target)
+                source = "local"
+        return {
+            "algorithm": "sha256",
+            "source": source,
+            "version": version or (published or {}).get("version") or "",
+            "generated": _now_iso(),
+            "files": files,
+        }
+
+    async def _published_manifest(self, remote_target: str) -> Optional[Dict[str, Any]]:
+        """``deckyfin-manifest.json`` kept by the host in the game folder, if any."""
+        hosts = self._download_hosts()
+        if not hosts:
+            return None
+        chunks: List[bytes] = []
+        result = await self._governor.execute(
+            "ssh",
+            hosts[0],
+            f"cat {shlex.quote(os.path.join(remote_target, MANIFEST_NAME))}",
+            timeout=self._timeout("ssh"),
+            background=False,
+            stdout_sink=chunks.append,
+        )
+        if not result.ok:
+            return None
+        try:
+            manifest = json.loads(b"".join(chunks))
+        except ValueError:
+            decky.logger.warning(
+                f"[Deckyfin] Ignoring unreadable manifest in {remote_target}"
+            )
+            return None
+        if not isinstance(manifest.get("files"), dict):
+            return None
+        return manifest
+
+    async def _remote_hash_tree(self, remote_target: str) -> Dict[str, Dict[str, Any]]:
+        """Hash a remote game folder with find/sha256sum over SSH."""
+        hosts = self._download_hosts()
+        if not hosts:
+            raise RuntimeError("Remote host is not configured")
+        host = hosts[0]
+        command = (
+            f"cd {shlex.quote(remote_target)} && "
+            f"find . -type f ! -name {MANIFEST_NAME} -printf '%s %P\\n' && "
+            "echo -- && "
+            f"find . -type f ! -name {MANIFEST_NAME} -exec sha256sum {{}} +"
+        )
+        chunks: List[bytes] = []
+        result = await self._governor.execute(
+            "ssh",
+            host,
+            command,
+            timeout=self._timeout("remoteHash"),
+            stdout_sink=chunks.append,
+        )
+        if not result.ok:
+            raise RuntimeError(result.describe())
+        stdout = b"".join(chunks)
+        sizes_text, _, hashes_text = f"\n{stdout.decode()}".partition("\n--\n")
+        files: Dict[str, Dict[str, Any]] = {}
+        for line in sizes_text.splitlines():
+            if not line:
+                continue
+            size, _, relative = line.partition(" ")
+            files[relative] = {"size": int(size)}
+        for line in hashes_text.splitlines():
+            digest, _, path = line.partition("  ")
+            relative = path[2:] if path.startswith("./") else path
+            if relative in files:
+                files[relative]["sha256"] = digest
+        return {
+            relative: entry for relative, entry in files.items() if "sha256" in entry
+        }
+
+    def _write_manifest(self, manifest_path: str, manifest: Dict[str, Any]) -> None:
+        self._served = None
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
+
+    def _read_prefix_metadata(self, prefix_path: str) -> Dict[str, Any]:
+        try:
+            with open(
+                os.path.join(prefix_path, "deckyfin.json"), "r", encoding="utf-8"
+            ) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_prefix_metadata(self, prefix_path: str, values: Dict[str, Any]) -> None:
+        metadata = {**self._read_prefix_metadata(prefix_path), **values}
+        os.makedirs(prefix_path, exist_ok=True)
+        with open(
+            os.path.join(prefix_path, "deckyfin.json"), "w", encoding="utf-8"
+        ) as handle:
+            json.dump(metadata, handle, indent=2)
+
+    def _read_manifest(self, game: Dict[str, Any]) -> Dict[str, Any]:
+        manifest_path = os.path.join(game["prefix_path"], MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            raise RuntimeError(
+                f"No file manifest for {game['name']}. Reinstall the game to create one."
+            )
+        with open(manifest_path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    async def _batch_download(
+        self, remote_base: str, targets: List[Dict[str, Any]]
+    ) -> None:
+        """Download several game folders in one rsync session.
+
+        Folders are fetched with their remote layout into a staging directory
+        next to the games folder, then renamed into their local targets.
+        """
+        staging = os.path.join(self.settings["localGamesPath"], BATCH_STAGING_NAME)
+        os.makedirs(staging, exist_ok=True)
+        relatives = [
+            os.path.relpath(target["remote_target"], remote_base) for target in targets
+        ]
+        unverified: List[str] = []
+        for relative, target in zip(relatives, targets):
+            # Seed the session with prefetched or peer copies so rsync only
+            # checks them against the remote host
+            staged = os.path.join(staging, relative)
+            if await self._claim_prefetched(target["local_target"], staged):
+                continue
+            pulled = await self._pull_from_peer(
+                os.path.basename(target["local_target"]),
+                staged,
+                target["remote_target"],
+            )
+            if pulled:
+                unverified.extend(f"{relative}/{path}" for path in pulled[1])
+        await self._rsync_file_list(remote_base, staging, relatives, download=True)
+        if unverified:
+            # The hosts published no hashes, so compare peer files in full
+            await self._rsync_file_list(
+                remote_base,
+                staging,
+                unverified,
+                download=True,
+                extra_flags=["--checksum"],
+            )
+
+        for relative, target in zip(relatives, targets):
+            source = os.path.join(staging, relative)
+            local_target = target["local_target"]
+            if not os.path.exists(local_target):
+                os.makedirs(os.path.dirname(local_target), exist_ok=True)
+                shutil.move(source, local_target)
+            else:
+                shutil.copytree(source, local_target, dirs_exist_ok=True)
+                shutil.rmtree(source)
+        shutil.rmtree(staging, ignore_errors=True)
+
     async def _rsync_file(self, remote_file: str, local_path: str) -> None:
         dest_dir = os.path.dirname(local_path)
         os.makedirs(dest_dir, exist_ok=True)
+        # Single small files (the catalog) are interactive, not bulk work
         await self._rsync(
             remote=remote_file,
             local=f"{dest_dir}{os.sep}",
             download=True,
+            background=False,
         )
 
     async def _rsync_directory(
@@ -571,6 +4002,8 @@ class Plugin:
         download: bool = False,
         upload: bool = False,
         delete: bool = False,
+        files_from: Optional[str] = None,
+        extra_flags: Optional[List[str]] = None,
     ) -> None:
         if download and upload:
             raise RuntimeError("Specify either download or upload, not both")
@@ -581,8 +4014,57 @@ class Plugin:
             download=download,
             upload=upload,
             delete=delete,
+            files_from=files_from,
+            extra_flags=extra_flags,
         )
 
+    async def _rsync_file_list(
+        self,
+        remote_path: str,
+        local_path: str,
+        relatives: List[str],
+        download: bool = False,
+        upload: bool = False,
+        extra_flags: Optional[List[str]] = None,
+    ) -> None:
+        """Transfer only ``relatives`` (paths below both directories)."""
+        with tempfile.NamedTemporaryFile(
+            "w", dir=DATA_DIR, suffix=".files", delete=False
+        ) as handle:
+            handle.write("\n".join(relatives) + "\n")
+            files_from = handle.name
+        try:
+            await self._rsync_directory(
+                remote_path,
+                local_path,
+                download=download,
+                upload=upload,
+                files_from=files_from,
+                extra_flags=extra_flags,
+            )
+        finally:
+            os.unlink(files_from)
+
+    def _remote_hosts(self) -> List[str]:
+        """Primary host followed by mirrors serving the same layout."""
+        hosts = [self.settings.get("remoteHost", "").strip()]
+        hosts.extend(host.strip() for host in self.settings.get("mirrorHosts") or [])
+        return [host for host in dict.fromkeys(hosts) if host]
+
+    def _download_hosts(self) -> List[str]:
+        return self._mirrors.ranked(self._remote_hosts())
+
+    async def _probe_mirrors(self) -> None:
+        """Refresh mirror health in the background while mirrors are configured."""
+        while True:
+            hosts = self._remote_hosts()
+            # Probing while a game runs would measure the game, not the mirror
+            if len(hosts) > 1 and not self._governor.gaming:
+                await asyncio.gather(*(self._mirrors.probe(host) for host in hosts))
+            await asyncio.sleep(
+                max(int(self.settings.get("mirrorProbeInterval", 300)), 30)
+            )
+
     async def _rsync(
         self,
         remote: str,
@@ -590,39 +4072,83 @@ class Plugin:
         download: bool = False,
         upload: bool = False,
         delete: bool = False,
+        files_from: Optional[str] = None,
+        extra_flags: Optional[List[str]] = None,
+        background: bool = True,
     ) -> None:
-        host = self.settings.get("remoteHost", "").strip()
-        if not host:
+        primary = self.settings.get("remoteHost", "").strip()
+        if not primary:
             raise RuntimeError("Remote host is not configured")
+        # Downloads may come from any mirror; uploads always go to the primary
+        hosts = self._download_hosts() if download else [primary]
         flags = shlex.split(self.settings.get("rsyncFlags", "-avz"))
         args = ["rsync", *flags]
         if delete:
             args.append("--delete")
-        if download:
-            source = f"{host}:{remote}"
-            destination = local
-        elif upload:
-            source = local
-            destination = f"{host}:{remote}"
-        else:
+        if files_from:
+            # Paths in the list are relative to the source directory;
+            # --files-from turns off the recursion implied by -a
+            args.extend([f"--files-from={files_from}", "--recursive"])
+        # Keep partially transferred files so a retry or the next mirror
+        # resumes them instead of starting over
+        args.append("--partial")
+        if extra_flags:
+            args.extend(extra_flags)
+        if not download and not upload:
             raise RuntimeError("Either download or upload must be True for rsync")
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                *args,
-                source,
-                destination,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-        except FileNotFoundError as err:
-            raise RuntimeError(
-                "rsync is not available on this system. Install rsync to enable remote sync."
-            ) from err
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(
-                f"rsync failed ({proc.returncode}): {stderr.decode().strip() or stdout.decode().strip()}"
-            )
+
+        error: Optional[RuntimeError] = None
+        for host in hosts:
+            if download:
+                source = f"{host}:{remote}"
+                destination = local
+            else:
+                source = local
+                destination = f"{host}:{remote}"
+            for attempt in range(1, RSYNC_PAUSE_RETRIES + 1):
+                pauses = self._governor.pause_count
+                try:
+                    result = await self._governor.execute(
+                        *args,
+                        *self._governor.rsync_flags(),
+                        source,
+                        destination,
+                        timeout=self._timeout("rsync"),
+                        background=background,
+                    )
+                except FileNotFoundError as err:
+                    raise RuntimeError(
+                        "rsync is not available on this system. Install rsync to enable remote sync."
+                    ) from err
+                if result.ok:
+                    if len(hosts) > 1:
+                        self._mirrors.record_success(host)
+                    return
+                error = RuntimeError(result.describe())
+                # A stalled transfer is worth retrying on the next host
+                if (
+                    result.returncode not in RSYNC_NETWORK_ERRORS
+                    and not result.timed_out
+                ):
+                    raise error
+                # A connection that dropped while the transfer was stopped for
+                # a game says nothing about the host; resume from --partial
+                if self._governor.pause_count == pauses:
+                    break
+                decky.logger.info(
+                    f"[Deckyfin] Transfer from {host} dropped while paused "
+                    f"(attempt {attempt}/{RSYNC_PAUSE_RETRIES}): {error}"
+                )
+            self._mirrors.record_failure(host, str(error))
+            if host != hosts[-1]:
+                decky.logger.warning(
+                    f"[Deckyfin] {host} failed mid-transfer, failing over: {error}"
+                )
+        raise error
+
+    def _timeout(self, operation: str) -> Optional[float]:
+        value = (self.settings.get("timeouts") or {}).get(operation)
+        return float(value) if value else None
 
     def _deep_merge(self, base: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
         result = json.loads(json.dumps(base))
@@ -649,19 +4175,17 @@ class Plugin:
 
         for dep in dependencies:
             try:
-                proc = await asyncio.create_subprocess_exec(
-                    PROTONTRICKS_CMD,
+                result = await self._governor.execute(
+                    *shlex.split(PROTONTRICKS_CMD),
                     str(steam_appid),
                     "--",
-                    PROTONTRICKS_FLAGS,
+                    *shlex.split(PROTONTRICKS_FLAGS),
                     dep,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                    timeout=self._timeout("protontricks"),
                 )
-                stdout, stderr = await proc.communicate()
-                if proc.returncode != 0:
+                if not result.ok:
                     decky.logger.warning(
-                        f"protontricks failed for {dep}: {stderr.decode().strip()}"
+                        f"protontricks failed for {dep}: {result.describe()}"
                     )
             except FileNotFoundError:
                 raise RuntimeError(
@@ -699,6 +4223,27 @@ class Plugin:
             self.settings["proton"]["compatdataPath"], str(game["steam_appid"])
         )
         sync_paths = game.get("proton_sync_paths", [])
+        archive_path = os.path.join(local_backup_path, PACKED_SAVE_ARCHIVE)
+        if game.get("save_mode") == "packed" and os.path.exists(archive_path):
+            targets = [
+                (
+                    self._save_archive_root(relative),
+                    self._resolve_proton_path(prefix_path, relative),
+                )
+                for relative in sync_paths
+            ]
+            mismatched = await asyncio.to_thread(
+                unpack_save_archive,
+                archive_path,
+                targets,
+                os.path.join(local_backup_path, PACKED_SAVE_INDEX),
+            )
+            if mismatched:
+                raise RuntimeError(
+                    f"Packed saves failed verification: {', '.join(mismatched)}"
+                )
+            return
+
         for relative in sync_paths:
             source = os.path.join(local_backup_path, self._sanitize_relative(relative))
             if os.path.exists(source):
@@ -714,8 +4259,34 @@ class Plugin:
         proton_version: str,
         categories: List[str],
         launch_options: str = "",
+        shader_cache: str = "",
     ) -> None:
-        """Add game to Steam library with categories and launch options.
+        """Add game to Steam library with categories and launch options."""
+        await self._apply_steam_shortcuts(
+            add=[
+                self._steam_shortcut_entry(
+                    steam_appid,
+                    name,
+                    exe_path,
+                    proton_version,
+                    categories,
+                    launch_options,
+                    shader_cache,
+                )
+            ]
+        )
+
+    def _steam_shortcut_entry(
+        self,
+        steam_appid: int,
+        name: str,
+        exe_path: str,
+        proton_version: str,
+        categories: List[str],
+        launch_options: str = "",
+        shader_cache: str = "",
+    ) -> Dict[str, Any]:
+        """Build the shortcuts.vdf entry for a game, including launch options.
 
         Uses the steam_appid directly (no fake appids needed since we use custom compatdata).
 
@@ -751,6 +4322,12 @@ class Plugin:
         # Steam's Compatibility tool setting (right-click game > Properties > Compatibility).
         # PROTON_USE_VERSION in launch options doesn't work reliably for non-Steam games.
         base_launch_opts = f"STEAM_COMPAT_DATA_PATH={compatdata_base} %command%"
+        if shader_cache:
+            # Point DXVK and VKD3D-Proton at the cache synced with the catalog
+            base_launch_opts = (
+                f"DXVK_STATE_CACHE_PATH={shader_cache} "
+                f"VKD3D_SHADER_CACHE_PATH={shader_cache} {base_launch_opts}"
+            )
 
         # If user provided launch options, merge them properly
         if launch_options:
@@ -771,44 +4348,60 @@ class Plugin:
             f"launch options: {final_launch_opts}"
         )
 
-        # Use VDF manipulation to add shortcut
-        await self._add_steam_shortcut_vdf(
-            appid=steam_appid,
-            name=name,
-            exe_path=exe_path,
-            proton_version=proton_version,
-            categories=categories,
-            launch_options=final_launch_opts,
-        )
+        # Note: We use appid parameter directly since it's the real game's appid
+        # Steam stores paths without extra quotes - the VDF library handles quoting
+        return {
+            "appid": steam_appid,  # Use the real appid - no conflicts since custom compatdata
+            "AppName": name,
+            "Exe": exe_path,  # No extra quotes - VDF library handles it
+            "StartDir": os.path.dirname(exe_path),
+            "icon": "",
+            "ShortcutPath": "",
+            "LaunchOptions": final_launch_opts,
+            "IsHidden": 0,
+            "AllowDesktopConfig": 1,
+            "AllowOverlay": 1,
+            "OpenVR": 0,
+            "Devkit": 0,
+            "DevkitGameID": "",
+            "DevkitOverrideAppID": 0,
+            "LastPlayTime": 0,
+            "tags": (
+                {str(i): cat for i, cat in enumerate(categories)} if categories else {}
+            ),
+        }
 
-    async def _add_steam_shortcut_vdf(
+    async def _apply_steam_shortcuts(
         self,
-        appid: int,
-        name: str,
-        exe_path: str,
-        proton_version: str,
-        categories: List[str],
-        launch_options: str,
+        add: Optional[List[Dict[str, Any]]] = None,
+        remove: Optional[List[int]] = None,
     ) -> None:
-        """Add Steam shortcut via VDF file manipulation.
+        """Add and remove Steam shortcuts via VDF file manipulation.
 
         Since we use custom compatdata, we can use the real appid without conflicts.
         Steam will use our STEAM_COMPAT_DATA_PATH from launch_options.
+        All changes to a user's shortcuts.vdf are applied in a single write, so
+        batch operations only rewrite the file once.
         """
-        userdata_base = os.path.join(USER_HOME, ".local", "share", "Steam", "userdata")
-        if not os.path.exists(userdata_base):
+        add = add or []
+        remove = remove or []
+        if not os.path.exists(self._steam_accounts.userdata_path):
             decky.logger.error("Steam userdata directory not found")
             return
 
-        # Find the first valid user directory
-        for user_id in os.listdir(userdata_base):
-            if not user_id.isdigit():
+        accounts = self._steam_accounts.accounts()
+        if not accounts:
+            decky.logger.error("No Steam account found")
+            return
+        removed: Set[int] = set()
+        for index, account in enumerate(accounts):
+            shortcuts_file = account["shortcuts"]
+            # New shortcuts go to the active account; removals check every
+            # account in case the game was added while another was logged in
+            additions = add if index == 0 else []
+            if not additions and not os.path.exists(shortcuts_file):
                 continue
 
-            shortcuts_file = os.path.join(
-                userdata_base, user_id, "config", "shortcuts.vdf"
-            )
-
             # Create config directory if it doesn't exist
             os.makedirs(os.path.dirname(shortcuts_file), exist_ok=True)
 
@@ -819,6 +4412,8 @@ class Plugin:
                         shortcuts_data = vdf.binary_load(f)
                 except Exception as e:
                     decky.logger.error(f"Failed to read shortcuts.vdf: {e}")
+                    if not additions:
+                        continue
                     shortcuts_data = {"shortcuts": {}}
             else:
                 shortcuts_data = {"shortcuts": {}}
@@ -826,61 +4421,51 @@ class Plugin:
             # Ensure shortcuts dict exists
             if "shortcuts" not in shortcuts_data:
                 shortcuts_data["shortcuts"] = {}
-
-            # Check if this shortcut already exists (by appid or name)
-            existing_key = None
-            for key, shortcut in shortcuts_data["shortcuts"].items():
-                # Match by appid first (most reliable), then by name
-                if shortcut.get("appid") == appid:
-                    existing_key = key
-                    decky.logger.info(
-                        f"Updating existing shortcut for '{name}' (appid: {appid})"
-                    )
-                    break
-                elif shortcut.get("AppName") == name:
-                    existing_key = key
+            shortcuts = shortcuts_data["shortcuts"]
+            changed = False
+
+            # Find and remove the shortcuts with matching appids
+            for key, shortcut in list(shortcuts.items()):
+                if shortcut.get("appid") in remove:
+                    del shortcuts[key]
+                    removed.add(shortcut.get("appid"))
+                    changed = True
                     decky.logger.info(
-                        f"Updating existing shortcut for '{name}' (matched by name)"
+                        f"Removed '{shortcut.get('AppName', 'Unknown')}' "
+                        f"(appid: {shortcut.get('appid')}) from Steam"
                     )
-                    break
 
-            # Generate next shortcut ID if creating new
-            if existing_key is None:
-                existing_ids = [
-                    int(k) for k in shortcuts_data["shortcuts"].keys() if k.isdigit()
-                ]
-                shortcut_id = str(max(existing_ids) + 1 if existing_ids else 0)
-            else:
-                shortcut_id = existing_key
-
-            # Create the shortcut entry
-            # Note: We use appid parameter directly since it's the real game's appid
-            # Steam stores paths without extra quotes - the VDF library handles quoting
-            shortcut_entry = {
-                "appid": appid,  # Use the real appid - no conflicts since custom compatdata
-                "AppName": name,
-                "Exe": exe_path,  # No extra quotes - VDF library handles it
-                "StartDir": os.path.dirname(exe_path),
-                "icon": "",
-                "ShortcutPath": "",
-                "LaunchOptions": launch_options,
-                "IsHidden": 0,
-                "AllowDesktopConfig": 1,
-                "AllowOverlay": 1,
-                "OpenVR": 0,
-                "Devkit": 0,
-                "DevkitGameID": "",
-                "DevkitOverrideAppID": 0,
-                "LastPlayTime": 0,
-                "tags": (
-                    {str(i): cat for i, cat in enumerate(categories)}
-                    if categories
-                    else {}
-                ),
-            }
+            for entry in additions:
+                # Check if this shortcut already exists (by appid or name)
+                existing_key = None
+                for key, shortcut in shortcuts.items():
+                    # Match by appid first (most reliable), then by name
+                    if shortcut.get("appid") == entry["appid"]:
+                        existing_key = key
+                        decky.logger.info(
+                            f"Updating existing shortcut for '{entry['AppName']}' "
+                            f"(appid: {entry['appid']})"
+                        )
+                        break
+                    elif shortcut.get("AppName") == entry["AppName"]:
+                        existing_key = key
+                        decky.logger.info(
+                            f"Updating existing shortcut for '{entry['AppName']}' "
+                            "(matched by name)"
+                        )
+                        break
+
+                # Generate next shortcut ID if creating new
+                if existing_key is None:
+                    existing_ids = [int(k) for k in shortcuts.keys() if k.isdigit()]
+                    existing_key = str(max(existing_ids) + 1 if existing_ids else 0)
 
-            # Add or update the shortcut
-            shortcuts_data["shortcuts"][shortcut_id] = shortcut_entry
+                # Add or update the shortcut
+                shortcuts[existing_key] = entry
+                changed = True
+
+            if not changed:
+                continue
 
             # Write back to file
             try:
@@ -891,15 +4476,14 @@ class Plugin:
                 with open(shortcuts_file, "wb") as f:
                     vdf.binary_dump(shortcuts_data, f)
 
-                decky.logger.info(
-                    f"Successfully added shortcut '{name}' (appid: {appid}) to Steam\n"
-                    f"  Exe: {exe_path}\n"
-                    f"  Launch Options: {launch_options}\n"
-                    f"  Categories: {categories}"
-                )
-
-                # Only process first valid user
-                break
+                for entry in additions:
+                    decky.logger.info(
+                        f"Successfully added shortcut '{entry['AppName']}' "
+                        f"(appid: {entry['appid']}) to Steam\n"
+                        f"  Exe: {entry['Exe']}\n"
+                        f"  Launch Options: {entry['LaunchOptions']}\n"
+                        f"  Categories: {list(entry['tags'].values())}"
+                    )
 
             except Exception as e:
                 decky.logger.error(f"Failed to write shortcuts.vdf: {e}")
@@ -907,60 +4491,12 @@ class Plugin:
                 if os.path.exists(f"{shortcuts_file}.backup"):
                     shutil.copy2(f"{shortcuts_file}.backup", shortcuts_file)
 
+        for appid in set(remove) - removed:
+            decky.logger.warning(f"No shortcut found with appid {appid}")
+
     async def _remove_from_steam(self, steam_appid: int) -> None:
         """Remove game from Steam library by appid."""
-        userdata_base = os.path.join(USER_HOME, ".local", "share", "Steam", "userdata")
-        if not os.path.exists(userdata_base):
-            decky.logger.error("Steam userdata directory not found")
-            return
-
-        for user_id in os.listdir(userdata_base):
-            if not user_id.isdigit():
-                continue
-
-            shortcuts_file = os.path.join(
-                userdata_base, user_id, "config", "shortcuts.vdf"
-            )
-
-            if not os.path.exists(shortcuts_file):
-                continue
-
-            try:
-                with open(shortcuts_file, "rb") as f:
-                    shortcuts_data = vdf.binary_load(f)
-
-                # Find and remove the shortcut with matching appid
-                shortcuts = shortcuts_data.get("shortcuts", {})
-                to_remove = None
-
-                for key, shortcut in shortcuts.items():
-                    if shortcut.get("appid") == steam_appid:
-                        to_remove = key
-                        name = shortcut.get("AppName", "Unknown")
-                        break
-
-                if to_remove:
-                    # Create backup before writing
-                    shutil.copy2(shortcuts_file, f"{shortcuts_file}.backup")
-
-                    del shortcuts[to_remove]
-
-                    # Write back
-                    with open(shortcuts_file, "wb") as f:
-                        vdf.binary_dump(shortcuts_data, f)
-
-                    decky.logger.info(
-                        f"Removed '{name}' (appid: {steam_appid}) from Steam"
-                    )
-                    break
-                else:
-                    decky.logger.warning(f"No shortcut found with appid {steam_appid}")
-
-            except Exception as e:
-                decky.logger.error(f"Failed to remove shortcut: {e}")
-                # Restore backup if something went wrong
-                if os.path.exists(f"{shortcuts_file}.backup"):
-                    shutil.copy2(f"{shortcuts_file}.backup", shortcuts_file)
+        await self._apply_steam_shortcuts(remove=[steam_appid])
 
     # async def _add_steam_shortcut_vdf(
     #     self,
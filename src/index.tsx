@@ -28,6 +28,20 @@ type ProtonConfig = {
     defaultVersion: string;
 };
 
+type SaveWatcherConfig = {
+    enabled: boolean;
+    quietPeriod: number;
+    pollInterval: number;
+};
+
+type PeersConfig = {
+    serve: boolean;
+    port: number;
+    discover: boolean;
+    discoveryPort: number;
+    hosts: string[] | string;
+};
+
 type DeckyfinSettings = {
     remoteHost: string;
     remoteConfigPath: string;
@@ -35,10 +49,15 @@ type DeckyfinSettings = {
     proton: ProtonConfig;
     saveBackupPath: string;
     rsyncFlags: string;
+    mirrorHosts: string[] | string;
+    mirrorProbeInterval: number;
+    saveWatcher: SaveWatcherConfig;
+    peers: PeersConfig;
 };
 
 type GameEntry = {
     name: string;
+    slug: string;
     path: string;
     remote_path: string;
     steam_appid: number;
@@ -48,7 +67,14 @@ type GameEntry = {
     executable?: string;
     categories?: string[];
     launch_options?: string;
+    save_mode: "loose" | "packed";
+    shader_cache_path?: string;
+    prefetch: boolean;
+    prefetched: boolean;
     installed: boolean;
+    version: string;
+    installed_version?: string | null;
+    update_available: boolean;
     prefix_ready: boolean;
     prefix_path: string;
     backup_path: string;
@@ -60,6 +86,28 @@ type GamesResponse = {
     games: GameEntry[];
     source: string;
     savesPath?: string;
+    errors: string[];
+    refreshedAt: string;
+};
+
+type StorageItem = {
+    kind: string;
+    path: string;
+    bytes: number;
+    reason: string;
+};
+
+type StorageReport = {
+    roots: { label: string; path: string; bytes: number }[];
+    games: {
+        name: string;
+        installed: boolean;
+        game_bytes: number;
+        prefix_bytes: number;
+        backup_bytes: number;
+    }[];
+    reclaimable: StorageItem[];
+    reclaimable_bytes: number;
     refreshedAt: string;
 };
 
@@ -70,6 +118,11 @@ type OperationResult = {
     failures?: string[];
     prefix_path?: string;
     steps?: string[];
+    missing?: string[];
+    mismatched?: string[];
+    repaired?: string[];
+    updated?: string[];
+    removed?: string[];
 };
 
 const api = {
@@ -78,6 +131,13 @@ const api = {
     loadGames: callable<[], GamesResponse>("load_games"),
     installGame: callable<[string], OperationResult>("install_game"),
     removeGame: callable<[string], OperationResult>("remove_game"),
+    updateGame: callable<[string], OperationResult>("update_game"),
+    installGames: callable<[string[]], OperationResult>("install_games"),
+    removeGames: callable<[string[]], OperationResult>("remove_games"),
+    verifyGame: callable<[string], OperationResult>("verify_game"),
+    repairGame: callable<[string], OperationResult>("repair_game"),
+    getStorageReport: callable<[], StorageReport>("get_storage_report"),
+    collectGarbage: callable<[boolean], OperationResult>("collect_garbage"),
     syncGame: callable<[string], OperationResult>("sync_game_saves"),
     syncAll: callable<[], OperationResult>("sync_all_saves"),
 };
@@ -107,12 +167,14 @@ const GameCard = ({
     game,
     onInstall,
     onRemove,
+    onUpdate,
     onSync,
     busy
 }: {
     game: GameEntry;
     onInstall: () => void;
     onRemove: () => void;
+    onUpdate: () => void;
     onSync: () => void;
     busy: boolean;
 }) => (
@@ -136,6 +198,11 @@ const GameCard = ({
                             {game.installed && <FaCheck />}
                             {game.installed ? "Installed" : "Not installed"}
                         </div>
+                        {game.update_available && (
+                            <div style={{ color: "#f6e58e", fontSize: "0.7rem" }}>
+                                Update available{game.version ? `: ${game.version}` : ""}
+                            </div>
+                        )}
                         {game.categories && game.categories.length > 0 && (
                             <div style={{ fontSize: "0.7rem", opacity: 0.7 }}>
                                 {game.categories.join(", ")}
@@ -177,6 +244,16 @@ const GameCard = ({
                         </ButtonItem>
                     ) : (
                         <>
+                            {game.update_available && (
+                                <ButtonItem
+                                    layout="below"
+                                    disabled={busy || !game.remote_available}
+                                    onClick={onUpdate}
+                                    icon={<FaCloudDownloadAlt />}
+                                >
+                                    {busy ? "Updating…" : "Update Game"}
+                                </ButtonItem>
+                            )}
                             <ButtonItem
                                 layout="below"
                                 disabled={busy}
@@ -211,6 +288,7 @@ function Content() {
     const [gamesMeta, setGamesMeta] = useState<{ source: string; refreshedAt: string } | null>(null);
     const [gamesLoading, setGamesLoading] = useState(false);
     const [globalError, setGlobalError] = useState<string | null>(null);
+    const [catalogErrors, setCatalogErrors] = useState<string[]>([]);
     const [busyMap, setBusyMap] = useState<Record<string, boolean>>({});
 
     const disableActions = gamesLoading || savingSettings;
@@ -257,6 +335,7 @@ function Content() {
         try {
             const payload = await api.loadGames();
             setGames(payload.games);
+            setCatalogErrors(payload.errors ?? []);
             setGamesMeta({ source: payload.source, refreshedAt: payload.refreshedAt });
         } catch (error) {
             console.error(error);
@@ -342,6 +421,17 @@ function Content() {
         }
     };
 
+    const handleUpdate = (name: string) => async () => {
+        const key = `update-${name}`;
+        markBusy(key, true);
+        try {
+            await callWithToaster(() => api.updateGame(name), "Game updated");
+        } finally {
+            markBusy(key, false);
+            loadGames();
+        }
+    };
+
     const handleSync = (name: string) => async () => {
         const key = `sync-${name}`;
         markBusy(key, true);
@@ -397,6 +487,16 @@ function Content() {
                         <div style={{ color: "#ff8e8e" }}>{globalError}</div>
                     </PanelSectionRow>
                 )}
+                {catalogErrors.length > 0 && (
+                    <PanelSectionRow>
+                        <div style={{ color: "#f6e58e", fontSize: "0.75rem" }}>
+                            <div>Skipped invalid catalog entries:</div>
+                            {catalogErrors.map(error => (
+                                <div key={error}>{error}</div>
+                            ))}
+                        </div>
+                    </PanelSectionRow>
+                )}
             </PanelSection>
 
             {settingsDraft && (
@@ -423,6 +523,20 @@ function Content() {
                             />
                         }
                     />
+                    <InputRow
+                        label="Mirror hosts"
+                        description="Optional extra user@host entries serving the same layout. Downloads use the fastest healthy host."
+                        input={
+                            <TextField
+                                value={
+                                    Array.isArray(settingsDraft.mirrorHosts)
+                                        ? settingsDraft.mirrorHosts.join(", ")
+                                        : settingsDraft.mirrorHosts ?? ""
+                                }
+                                onChange={handleTextChange(["mirrorHosts"])}
+                            />
+                        }
+                    />
                     <InputRow
                         label="Remote config file path"
                         description="Full path to deckyfin-config.json on remote host (e.g., /path/to/deckyfin-config.json)."
@@ -443,6 +557,36 @@ function Content() {
                             />
                         }
                     />
+                    <PanelSectionRow>
+                        <ToggleField
+                            label="Back up saves automatically"
+                            description="Watch installed games' save folders and upload changed files after a short quiet period."
+                            checked={settingsDraft.saveWatcher?.enabled ?? false}
+                            onChange={(value: boolean) => mutateDraft(["saveWatcher", "enabled"], value)}
+                        />
+                    </PanelSectionRow>
+                    <PanelSectionRow>
+                        <ToggleField
+                            label="Share games with nearby Decks"
+                            description="Serve installed games to other Deckyfin devices on the local network."
+                            checked={settingsDraft.peers?.serve ?? false}
+                            onChange={(value: boolean) => mutateDraft(["peers", "serve"], value)}
+                        />
+                    </PanelSectionRow>
+                    <InputRow
+                        label="Peer devices"
+                        description="Optional host or host:port entries to try before the remote host, in addition to devices found on the network."
+                        input={
+                            <TextField
+                                value={
+                                    Array.isArray(settingsDraft.peers?.hosts)
+                                        ? settingsDraft.peers.hosts.join(", ")
+                                        : settingsDraft.peers?.hosts ?? ""
+                                }
+                                onChange={handleTextChange(["peers", "hosts"])}
+                            />
+                        }
+                    />
                 </PanelSection>
             )}
 
@@ -488,6 +632,7 @@ function Content() {
                     const busy =
                         busyMap[`download-${game.name}`] ||
                         busyMap[`setup-${game.steam_appid}`] ||
+                        busyMap[`update-${game.name}`] ||
                         busyMap[`sync-${game.name}`] ||
                         disableActions;
                     return (
@@ -497,6 +642,7 @@ function Content() {
                             busy={busy}
                             onInstall={handleInstall(game.name)}
                             onRemove={handleRemove(game.name)}
+                            onUpdate={handleUpdate(game.name)}
                             onSync={handleSync(game.name)}
                         />
                     );